@@ -0,0 +1,25 @@
+"""Shared pytest fixtures."""
+
+from datetime import datetime
+
+import pytest
+
+from wombat_miles.scrapers import AeroplanScraper, AlaskaScraper
+
+
+@pytest.fixture(scope="session")
+def aeroplan_scraper() -> AeroplanScraper:
+    """One AeroplanScraper shared by every test (parsing is stateless)."""
+    return AeroplanScraper()
+
+
+@pytest.fixture(scope="session")
+def alaska_scraper() -> AlaskaScraper:
+    """One AlaskaScraper shared by every test (parsing is stateless)."""
+    return AlaskaScraper()
+
+
+@pytest.fixture(scope="session")
+def base_time() -> datetime:
+    """Shared departure anchor for connection tests (datetimes are immutable)."""
+    return datetime(2025, 6, 15, 8, 0)
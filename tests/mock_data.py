@@ -1,4 +1,12 @@
-"""Mock API responses for testing."""
+"""Mock API responses for testing.
+
+Every response is frozen at import (read-only mappings, tuples for lists) so
+a test cannot mutate a fixture another test relies on. ``*_BYTES`` variants
+hold the same payload serialized once, for tests that exercise decoding.
+"""
+
+import json
+from types import MappingProxyType
 
 ALASKA_RESPONSE = {
     "slices": [
@@ -317,3 +325,24 @@ AEROPLAN_ERROR_RESPONSE = {
         {"title": "No flights available for the requested route"}
     ]
 }
+
+
+def _freeze(obj):
+    """Recursively convert dicts/lists into read-only mappings/tuples."""
+    if isinstance(obj, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in obj.items()})
+    if isinstance(obj, list):
+        return tuple(_freeze(v) for v in obj)
+    return obj
+
+
+ALASKA_RESPONSE_BYTES = json.dumps(ALASKA_RESPONSE).encode()
+AEROPLAN_RESPONSE_BYTES = json.dumps(AEROPLAN_RESPONSE).encode()
+
+ALASKA_RESPONSE = _freeze(ALASKA_RESPONSE)
+ALASKA_EMPTY_RESPONSE = _freeze(ALASKA_EMPTY_RESPONSE)
+ALASKA_NO_SLICES_RESPONSE = _freeze(ALASKA_NO_SLICES_RESPONSE)
+ALASKA_INTL_RESPONSE = _freeze(ALASKA_INTL_RESPONSE)
+AEROPLAN_RESPONSE = _freeze(AEROPLAN_RESPONSE)
+AEROPLAN_EMPTY_RESPONSE = _freeze(AEROPLAN_EMPTY_RESPONSE)
+AEROPLAN_ERROR_RESPONSE = _freeze(AEROPLAN_ERROR_RESPONSE)
@@ -1,21 +1,19 @@
 """Tests for Aeroplan scraper."""
 
-import sys
-import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import pytest
 
-from wombat_miles.scrapers.aeroplan import AeroplanScraper
+from wombat_miles.scrapers.aeroplan import _loads
 from tests.mock_data import (
     AEROPLAN_RESPONSE,
+    AEROPLAN_RESPONSE_BYTES,
     AEROPLAN_EMPTY_RESPONSE,
     AEROPLAN_ERROR_RESPONSE,
 )
 
 
-def test_parse_basic():
+def test_parse_basic(aeroplan_scraper):
     """Test parsing a normal Aeroplan response."""
-    scraper = AeroplanScraper()
-    flights = scraper._parse_response(AEROPLAN_RESPONSE, "SFO", "YYZ")
+    flights = aeroplan_scraper._parse_response(AEROPLAN_RESPONSE, "SFO", "YYZ")
 
     # Should get 2 direct flights (connection skipped)
     assert len(flights) == 2, f"Expected 2 flights, got {len(flights)}"
@@ -35,20 +33,19 @@ def test_parse_basic():
     assert "business" in cabins
     assert "economy" in cabins
 
-    biz = next(f for f in f1.fares if f.cabin == "business")
+    biz = f1["business"]
     assert biz.miles == 60000
     assert biz.cash == 250.0  # 25000 cents = $250
     assert biz.booking_class == "J"
     assert biz.program == "aeroplan"
 
-    eco = next(f for f in f1.fares if f.cabin == "economy")
+    eco = f1["economy"]
     assert eco.miles == 25000
 
 
-def test_parse_second_flight():
+def test_parse_second_flight(aeroplan_scraper):
     """Test the second flight in the response."""
-    scraper = AeroplanScraper()
-    flights = scraper._parse_response(AEROPLAN_RESPONSE, "SFO", "YYZ")
+    flights = aeroplan_scraper._parse_response(AEROPLAN_RESPONSE, "SFO", "YYZ")
 
     f2 = flights[1]
     assert f2.flight_no == "AC 760"
@@ -60,57 +57,65 @@ def test_parse_second_flight():
     assert f2.fares[0].miles == 70000
 
 
-def test_connections_skipped_by_default():
-    """Test that connecting flights are skipped when max_stops=0."""
-    scraper = AeroplanScraper()
-    flights = scraper._parse_response(AEROPLAN_RESPONSE, "SFO", "YYZ", max_stops=0)
-    assert len(flights) == 2
+@pytest.mark.parametrize(
+    "max_stops, expected_direct, expected_connecting",
+    [(0, 2, 0), (1, 2, 1)],
+)
+def test_max_stops(aeroplan_scraper, max_stops, expected_direct, expected_connecting):
+    """Connections (via YVR) are only included when max_stops >= 1."""
+    flights = aeroplan_scraper._parse_response(AEROPLAN_RESPONSE, "SFO", "YYZ", max_stops=max_stops)
+    assert len(flights) == expected_direct + expected_connecting
     for f in flights:
         assert f.origin == "SFO"
         assert f.destination == "YYZ"
-        assert f.is_direct
-
-
-def test_connections_included():
-    """Test connecting flights included when max_stops >= 1."""
-    scraper = AeroplanScraper()
-    flights = scraper._parse_response(AEROPLAN_RESPONSE, "SFO", "YYZ", max_stops=1)
-    # Should get 3 (2 direct + 1 connection via YVR)
-    assert len(flights) == 3
     connecting = [f for f in flights if not f.is_direct]
-    assert len(connecting) == 1
-    conn = connecting[0]
-    assert conn.stops == 1
-    assert len(conn.segments) == 2
-    assert conn.segments[0].destination == "YVR"
+    assert len(connecting) == expected_connecting
+    for conn in connecting:
+        assert conn.stops == 1
+        assert len(conn.segments) == 2
+        assert conn.segments[0].destination == "YVR"
 
 
-def test_parse_empty():
+def test_parse_empty(aeroplan_scraper):
     """Test empty response."""
-    scraper = AeroplanScraper()
-    flights = scraper._parse_response(AEROPLAN_EMPTY_RESPONSE, "SFO", "YYZ")
+    flights = aeroplan_scraper._parse_response(AEROPLAN_EMPTY_RESPONSE, "SFO", "YYZ")
     assert flights == []
 
 
-def test_parse_error():
+def test_parse_error(aeroplan_scraper):
     """Test error response."""
-    scraper = AeroplanScraper()
-    flights = scraper._parse_response(AEROPLAN_ERROR_RESPONSE, "SFO", "YYZ")
+    flights = aeroplan_scraper._parse_response(AEROPLAN_ERROR_RESPONSE, "SFO", "YYZ")
     assert flights == []
 
 
-def test_origin_dest_filter():
+def test_origin_dest_filter(aeroplan_scraper):
     """Test origin/destination filtering."""
-    scraper = AeroplanScraper()
     # Search for SFO->LHR but response has SFO->YYZ
-    flights = scraper._parse_response(AEROPLAN_RESPONSE, "SFO", "LHR")
+    flights = aeroplan_scraper._parse_response(AEROPLAN_RESPONSE, "SFO", "LHR")
     assert flights == []
 
 
-def test_cabin_mapping():
+def test_empty_segments_skipped(aeroplan_scraper):
+    """A bound group without segments is skipped instead of raising."""
+    groups = [{"boundDetails": {"segments": []}, "airBounds": []}, *AEROPLAN_RESPONSE["data"]["airBoundGroups"]]
+    raw = {**AEROPLAN_RESPONSE, "data": {"airBoundGroups": groups}}
+    flights = aeroplan_scraper._parse_response(raw, "SFO", "YYZ")
+    assert len(flights) == 2
+
+
+def test_null_fields_do_not_abort_parse(aeroplan_scraper):
+    """JSON nulls in string fields are kept as None instead of raising."""
+    raw = _loads(AEROPLAN_RESPONSE_BYTES)
+    # Second leg of the SFO → YVR → YYZ connection
+    raw["dictionaries"]["flight"]["FL004"]["departure"]["locationCode"] = None
+    flights = aeroplan_scraper._parse_response(raw, "SFO", "YYZ", max_stops=1)
+    assert len(flights) == 3
+    assert flights[-1].segments[1].origin is None
+
+
+def test_cabin_mapping(aeroplan_scraper):
     """Test that cabin names are correctly mapped."""
-    scraper = AeroplanScraper()
-    flights = scraper._parse_response(AEROPLAN_RESPONSE, "SFO", "YYZ")
+    flights = aeroplan_scraper._parse_response(AEROPLAN_RESPONSE, "SFO", "YYZ")
     f = flights[0]
     cabin_set = {fare.cabin for fare in f.fares}
     # All cabins should be normalized
@@ -118,13 +123,8 @@ def test_cabin_mapping():
         assert c in ("economy", "business", "first"), f"Unexpected cabin: {c}"
 
 
-if __name__ == "__main__":
-    test_parse_basic()
-    test_parse_second_flight()
-    test_connections_skipped_by_default()
-    test_connections_included()
-    test_parse_empty()
-    test_parse_error()
-    test_origin_dest_filter()
-    test_cabin_mapping()
-    print("✅ All Aeroplan tests passed!")
+def test_parse_from_bytes(aeroplan_scraper):
+    """Decoding the raw body then parsing matches parsing the dict fixture."""
+    from_bytes = aeroplan_scraper._parse_response(_loads(AEROPLAN_RESPONSE_BYTES), "SFO", "YYZ", max_stops=1)
+    from_dict = aeroplan_scraper._parse_response(AEROPLAN_RESPONSE, "SFO", "YYZ", max_stops=1)
+    assert from_bytes == from_dict
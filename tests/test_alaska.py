@@ -1,22 +1,20 @@
 """Tests for Alaska Atmos Rewards scraper."""
 
-import sys
-import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import pytest
 
-from wombat_miles.scrapers.alaska import AlaskaScraper
+from wombat_miles.scrapers.alaska import AlaskaScraper, _loads
 from tests.mock_data import (
     ALASKA_RESPONSE,
+    ALASKA_RESPONSE_BYTES,
     ALASKA_EMPTY_RESPONSE,
     ALASKA_NO_SLICES_RESPONSE,
     ALASKA_INTL_RESPONSE,
 )
 
 
-def test_parse_basic():
+def test_parse_basic(alaska_scraper):
     """Test parsing a normal Alaska API response."""
-    scraper = AlaskaScraper()
-    flights = scraper._parse_response(ALASKA_RESPONSE, "SFO", "LAX")
+    flights = alaska_scraper._parse_response(ALASKA_RESPONSE, "SFO", "LAX")
 
     # Should get 2 direct flights (connection skipped)
     assert len(flights) == 2, f"Expected 2 flights, got {len(flights)}"
@@ -36,33 +34,30 @@ def test_parse_basic():
     assert "business" in cabins
 
     # Economy should pick the lowest (SAVER at 5000, not MAIN at 7500)
-    eco_fare = next(f for f in f1.fares if f.cabin == "economy")
+    eco_fare = f1["economy"]
     assert eco_fare.miles == 5000
     assert eco_fare.is_saver is True
 
     # Business/First (mapped to business)
-    biz_fare = next(f for f in f1.fares if f.cabin == "business")
+    biz_fare = f1["business"]
     assert biz_fare.miles == 15000
 
 
-def test_parse_empty():
+def test_parse_empty(alaska_scraper):
     """Test parsing empty response."""
-    scraper = AlaskaScraper()
-    flights = scraper._parse_response(ALASKA_EMPTY_RESPONSE, "SFO", "LAX")
+    flights = alaska_scraper._parse_response(ALASKA_EMPTY_RESPONSE, "SFO", "LAX")
     assert flights == []
 
 
-def test_parse_no_slices():
+def test_parse_no_slices(alaska_scraper):
     """Test parsing response with no slices key."""
-    scraper = AlaskaScraper()
-    flights = scraper._parse_response(ALASKA_NO_SLICES_RESPONSE, "SFO", "LAX")
+    flights = alaska_scraper._parse_response(ALASKA_NO_SLICES_RESPONSE, "SFO", "LAX")
     assert flights == []
 
 
-def test_parse_international():
+def test_parse_international(alaska_scraper):
     """Test parsing international business class response."""
-    scraper = AlaskaScraper()
-    flights = scraper._parse_response(ALASKA_INTL_RESPONSE, "SEA", "NRT")
+    flights = alaska_scraper._parse_response(ALASKA_INTL_RESPONSE, "SEA", "NRT")
 
     assert len(flights) == 1
     f = flights[0]
@@ -79,10 +74,9 @@ def test_parse_international():
     assert biz.booking_class == "J"
 
 
-def test_connections_skipped_by_default():
+def test_connections_skipped_by_default(alaska_scraper):
     """Test that connecting flights are skipped when max_stops=0."""
-    scraper = AlaskaScraper()
-    flights = scraper._parse_response(ALASKA_RESPONSE, "SFO", "LAX", max_stops=0)
+    flights = alaska_scraper._parse_response(ALASKA_RESPONSE, "SFO", "LAX", max_stops=0)
     # Only 2 direct flights, not the connection
     assert len(flights) == 2
     for f in flights:
@@ -92,10 +86,9 @@ def test_connections_skipped_by_default():
         assert f.stops == 0
 
 
-def test_connections_included():
+def test_connections_included(alaska_scraper):
     """Test that connecting flights are included when max_stops >= 1."""
-    scraper = AlaskaScraper()
-    flights = scraper._parse_response(ALASKA_RESPONSE, "SFO", "LAX", max_stops=1)
+    flights = alaska_scraper._parse_response(ALASKA_RESPONSE, "SFO", "LAX", max_stops=1)
     # Should get all 3 (2 direct + 1 connection via SEA)
     assert len(flights) == 3
 
@@ -111,25 +104,53 @@ def test_connections_included():
     assert "1 stop (SEA)" == conn.stops_display()
 
 
-def test_origin_dest_filter():
+def test_origin_dest_filter(alaska_scraper):
     """Test that mismatched origin/destination flights are filtered."""
-    scraper = AlaskaScraper()
     # Search for SEA->LAX but response has SFO->LAX flights
-    flights = scraper._parse_response(ALASKA_RESPONSE, "SEA", "LAX")
+    flights = alaska_scraper._parse_response(ALASKA_RESPONSE, "SEA", "LAX")
     assert flights == []
 
 
+def test_empty_segments_skipped(alaska_scraper):
+    """A slice without segments is skipped instead of raising."""
+    raw = {"slices": [{"segments": [], "fares": {}}, *ALASKA_RESPONSE["slices"]]}
+    flights = alaska_scraper._parse_response(raw, "SFO", "LAX")
+    assert len(flights) == 2
+
+
+def test_null_fields_do_not_abort_parse(alaska_scraper):
+    """JSON nulls in string fields are kept as None instead of raising."""
+    raw = _loads(ALASKA_RESPONSE_BYTES)
+    first_slice = raw["slices"][0]
+    next(iter(first_slice["fares"].values()))["bookingCodes"] = [None]
+    flights = alaska_scraper._parse_response(raw, "SFO", "LAX")
+    assert len(flights) == 2
+
+
 def test_duration_parse():
     """Test duration parsing."""
     assert AlaskaScraper._parse_duration("95") == 95
     assert AlaskaScraper._parse_duration("2h30m") == 150
     assert AlaskaScraper._parse_duration("10h0m") == 600
+    assert AlaskaScraper._parse_duration("2h") == 120
+    assert AlaskaScraper._parse_duration("45m") == 45
+
+
+def test_duration_parse_malformed():
+    """Strings without h/m parse to 0; a bad number in either part raises."""
+    assert AlaskaScraper._parse_duration("abc") == 0
+    assert AlaskaScraper._parse_duration("PT2H30M") == 0
+    # Minutes without a trailing "m" are ignored
+    assert AlaskaScraper._parse_duration("2h30") == 120
+    with pytest.raises(ValueError):
+        AlaskaScraper._parse_duration("xh5m")
+    with pytest.raises(ValueError):
+        AlaskaScraper._parse_duration("2hxm")
 
 
-def test_best_fare():
+def test_best_fare(alaska_scraper):
     """Test Flight.best_fare() method."""
-    scraper = AlaskaScraper()
-    flights = scraper._parse_response(ALASKA_RESPONSE, "SFO", "LAX")
+    flights = alaska_scraper._parse_response(ALASKA_RESPONSE, "SFO", "LAX")
     f = flights[0]
 
     best_biz = f.best_fare("business")
@@ -145,14 +166,8 @@ def test_best_fare():
     assert best_any.miles == 5000  # economy saver is cheapest
 
 
-if __name__ == "__main__":
-    test_parse_basic()
-    test_parse_empty()
-    test_parse_no_slices()
-    test_parse_international()
-    test_connections_skipped_by_default()
-    test_connections_included()
-    test_origin_dest_filter()
-    test_duration_parse()
-    test_best_fare()
-    print("✅ All Alaska tests passed!")
+def test_parse_from_bytes(alaska_scraper):
+    """Decoding the raw body then parsing matches parsing the dict fixture."""
+    from_bytes = alaska_scraper._parse_response(_loads(ALASKA_RESPONSE_BYTES), "SFO", "LAX", max_stops=1)
+    from_dict = alaska_scraper._parse_response(ALASKA_RESPONSE, "SFO", "LAX", max_stops=1)
+    assert from_bytes == from_dict
@@ -4,7 +4,7 @@ import json
 import sqlite3
 import time
 from pathlib import Path
-from unittest.mock import MagicMock, patch, call
+from unittest.mock import patch, call
 from datetime import date
 
 import pytest
@@ -15,10 +15,16 @@ import pytest
 
 @pytest.fixture(autouse=True)
 def tmp_alerts_db(tmp_path, monkeypatch):
-    """Redirect the alerts DB to a temp directory for each test."""
+    """Give each test its own in-memory alerts DB (dropped on teardown)."""
     monkeypatch.setattr("wombat_miles.alerts.ALERTS_DIR", tmp_path)
-    monkeypatch.setattr("wombat_miles.alerts.ALERTS_DB", tmp_path / "alerts.db")
+    monkeypatch.setattr("wombat_miles.alerts.ALERTS_DB", ":memory:")
+    # New-low checks read price history; keep them off the user's real DB
+    monkeypatch.setattr("wombat_miles.price_history.HISTORY_DIR", tmp_path)
+    monkeypatch.setattr("wombat_miles.price_history.HISTORY_FILE", ":memory:")
     yield
+    from wombat_miles import alerts, price_history
+    alerts._reset_pool()
+    price_history._reset_pool()
 
 
 @pytest.fixture
@@ -43,13 +49,7 @@ def sample_search_results():
         aircraft="789",
         fares=[fare],
     )
-    result = MagicMock()
-    result.origin = "SFO"
-    result.destination = "NRT"
-    result.date = "2025-06-01"
-    result.flights = [flight]
-    result.errors = []
-    return [result]
+    return [SearchResult(origin="SFO", destination="NRT", date="2025-06-01", flights=[flight])]
 
 
 # ---------------------------------------------------------------------------
@@ -113,11 +113,58 @@ class TestAlertCRUD:
     def test_multiple_alerts(self):
         from wombat_miles import alerts
 
-        alerts.add_alert("SFO", "NRT", cabin="business")
-        alerts.add_alert("SFO", "YYZ", cabin="economy")
-        alerts.add_alert("LAX", "LHR")
+        alerts.add_alerts_bulk([
+            {"origin": "SFO", "destination": "NRT", "cabin": "business"},
+            {"origin": "SFO", "destination": "YYZ", "cabin": "economy"},
+            {"origin": "LAX", "destination": "LHR"},
+        ])
         assert len(alerts.list_alerts()) == 3
 
+    def test_add_alerts_bulk_returns_ids_in_order(self):
+        from wombat_miles import alerts
+
+        first = alerts.add_alert("SEA", "HND")
+        ids = alerts.add_alerts_bulk([
+            {"origin": "sfo", "destination": "nrt", "webhooks": ["https://example.com/hook"]},
+            {"origin": "LAX", "destination": "LHR", "max_miles": 80_000},
+        ])
+        assert ids == [first + 1, first + 2]
+        assert alerts.get_alert(ids[0]).route == "SFO → NRT"
+        assert alerts.get_alert(ids[0]).webhooks == ["https://example.com/hook"]
+        assert alerts.get_alert(ids[1]).max_miles == 80_000
+
+    def test_add_alerts_bulk_empty(self):
+        from wombat_miles import alerts
+
+        assert alerts.add_alerts_bulk([]) == []
+        assert alerts.list_alerts() == []
+
+
+# ---------------------------------------------------------------------------
+# Data model tests
+# ---------------------------------------------------------------------------
+
+class TestAlertDataclasses:
+    def test_slotted(self):
+        from wombat_miles import alerts
+
+        for cls in (alerts.Alert, alerts.EmailConfig, alerts.TriggeredAlert):
+            assert "__slots__" in vars(cls)
+
+    def test_list_alerts_reads_all_columns(self):
+        from wombat_miles import alerts
+
+        aid = alerts.add_alert("SFO", "NRT", cabin="first", program="alaska",
+                               max_miles=90_000, email_to=["a@test.com"], email_config="default")
+        a = alerts.list_alerts()[0]
+        assert (a.id, a.origin, a.destination, a.cabin, a.program, a.max_miles) == (
+            aid, "SFO", "NRT", "first", "alaska", 90_000,
+        )
+        assert a.email_to == ["a@test.com"]
+        assert a.email_config == "default"
+        assert a.enabled == 1
+        assert a.created_at
+
 
 # ---------------------------------------------------------------------------
 # check_alerts tests
@@ -183,6 +230,15 @@ class TestCheckAlerts:
         triggered2 = alerts.check_alerts(sample_search_results, dedup_hours=24)
         assert len(triggered2) == 0
 
+    def test_dedup_lookup_batches_alert_ids(self, sample_search_results, monkeypatch):
+        from wombat_miles import alerts
+
+        monkeypatch.setattr(alerts, "_DEDUP_BATCH", 2)
+        for _ in range(5):
+            alerts.add_alert("SFO", "NRT", cabin="business")
+        alerts.fire_alerts(alerts.check_alerts(sample_search_results))
+        assert alerts.check_alerts(sample_search_results) == []
+
     def test_dedup_zero_allows_refire(self, sample_search_results):
         from wombat_miles import alerts
 
@@ -194,6 +250,164 @@ class TestCheckAlerts:
         triggered2 = alerts.check_alerts(sample_search_results, dedup_hours=0)
         assert len(triggered2) == 1
 
+    def test_dedup_is_per_fare_not_per_alert(self, sample_search_results):
+        from wombat_miles import alerts
+
+        alerts.add_alert("SFO", "NRT", cabin="business")
+        triggered = alerts.check_alerts(sample_search_results)
+        alerts.fire_alert(triggered[0], dry_run=True)
+
+        # A cheaper fare on the same flight is a new combo and must fire again
+        sample_search_results[0].flights[0].fares[0].miles = 55_000
+        triggered2 = alerts.check_alerts(sample_search_results)
+        assert len(triggered2) == 1
+        assert triggered2[0].miles == 55_000
+
+    def test_alerts_only_visit_their_own_route(self, sample_search_results):
+        from wombat_miles import alerts
+
+        alerts.add_alerts_bulk([
+            {"origin": "LAX", "destination": "NRT"},
+            {"origin": "SFO", "destination": "NRT", "cabin": "business"},
+            {"origin": "SFO", "destination": "HND"},
+        ])
+        triggered = alerts.check_alerts(sample_search_results)
+        assert [t.alert.route for t in triggered] == ["SFO → NRT"]
+
+    def test_accepts_generator_input(self, sample_search_results):
+        from wombat_miles import alerts
+
+        alerts.add_alert("SFO", "NRT", cabin="business")
+        triggered = alerts.check_alerts(r for r in sample_search_results)
+        assert len(triggered) == 1
+
+    def test_new_low_flagged_against_price_history(self, sample_search_results):
+        from wombat_miles import alerts, price_history
+
+        price_history.record_results(sample_search_results)
+        alerts.add_alert("SFO", "NRT", cabin="business")
+        cheaper = sample_search_results[0].flights[0].fares[0]
+        cheaper.miles = 55_000
+        triggered = alerts.check_alerts(sample_search_results)
+        assert triggered[0].is_new_low
+        assert triggered[0].prev_low_miles == 65_000
+
+    def test_historical_lows_fetched_once_per_run(self, sample_search_results):
+        from wombat_miles import alerts
+
+        result = sample_search_results[0]
+        result.flights = result.flights * 5
+        alerts.add_alert("SFO", "NRT", cabin="business")
+        alerts.add_alert("SFO", "NRT", cabin="business", program="alaska")
+        with patch("wombat_miles.alerts._route_lows", return_value={}) as lows:
+            triggered = alerts.check_alerts(sample_search_results)
+        assert len(triggered) == 10
+        assert not any(t.is_new_low for t in triggered)
+        lows.assert_called_once_with({("SFO", "NRT")})
+
+    def test_disabled_alert_in_explicit_list_skipped(self, sample_search_results):
+        from wombat_miles import alerts
+
+        aid = alerts.add_alert("SFO", "NRT", cabin="business")
+        alerts.enable_alert(aid, enabled=False)
+        disabled = alerts.list_alerts(include_disabled=True)
+        assert alerts.check_alerts(sample_search_results, alerts=disabled) == []
+
+    def test_connection_reused(self):
+        from wombat_miles import alerts
+
+        conn = alerts._get_conn()
+        assert alerts._get_conn() is conn
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+
+    def test_connection_pool_is_per_thread(self):
+        import threading
+        from wombat_miles import alerts
+
+        main_conn = alerts._get_conn()
+        seen = []
+
+        def use_pool():
+            seen.append(alerts._get_conn())
+            alerts._reset_pool()
+
+        worker = threading.Thread(target=use_pool)
+        worker.start()
+        worker.join()
+        assert seen[0] is not main_conn
+
+    def test_dedup_lookup_uses_covering_index(self):
+        from wombat_miles import alerts
+
+        conn = alerts._get_conn()
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN " + alerts._SQL_DEDUP.format(placeholders="?,?"),
+            (1, 2, 0.0),
+        ).fetchall()
+        assert any("COVERING INDEX idx_hist_dedup" in row[3] for row in plan)
+
+    def test_enabled_listing_uses_partial_index(self):
+        from wombat_miles import alerts
+
+        plan = alerts._get_conn().execute(
+            "EXPLAIN QUERY PLAN " + alerts._SQL_LIST_ENABLED
+        ).fetchall()
+        assert any("idx_alerts_active_id" in row[3] for row in plan)
+
+    def test_enabled_listing_skips_disabled(self):
+        from wombat_miles import alerts
+
+        keep = alerts.add_alert("SFO", "NRT")
+        off = alerts.add_alert("SFO", "HND")
+        alerts.enable_alert(off, enabled=False)
+        assert [a.id for a in alerts.list_alerts()] == [keep]
+        alerts.enable_alert(off, enabled=True)
+        assert [a.id for a in alerts.list_alerts()] == [keep, off]
+
+    def test_listing_skips_legacy_columns(self):
+        from wombat_miles import alerts
+
+        alert_id = alerts.add_alert("SFO", "NRT", webhooks=["https://example.com/hook"])
+        row = alerts._get_conn().execute(alerts._SQL_GET, (alert_id,)).fetchone()
+        assert "discord_webhook" not in row.keys()
+        assert alerts.get_alert(alert_id).webhooks == ["https://example.com/hook"]
+
+    def test_recent_history_avoids_sort(self):
+        from wombat_miles import alerts
+
+        plan = alerts._get_conn().execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM alert_history ORDER BY fired_at DESC LIMIT ?",
+            (50,),
+        ).fetchall()
+        details = " ".join(row[3] for row in plan)
+        assert "idx_hist_fired" in details
+        assert "TEMP B-TREE" not in details
+
+
+class TestFarePredicate:
+    @pytest.mark.parametrize(
+        "program,max_miles,fare_program,fare_miles,expected",
+        [
+            ("all", None, "alaska", 90_000, True),
+            ("all", 70_000, "alaska", 70_000, True),
+            ("all", 70_000, "alaska", 70_001, False),
+            ("aeroplan", None, "aeroplan", 90_000, True),
+            ("aeroplan", None, "alaska", 10_000, False),
+            ("alaska", 70_000, "alaska", 65_000, True),
+            ("alaska", 70_000, "aeroplan", 65_000, False),
+            ("alaska", 70_000, "alaska", 75_000, False),
+        ],
+    )
+    def test_matches_unspecialized_checks(self, program, max_miles, fare_program, fare_miles, expected):
+        from wombat_miles.alerts import Alert, _fare_predicate
+        from wombat_miles.models import FlightFare
+
+        alert = Alert(id=1, origin="SFO", destination="NRT", cabin=None,
+                      program=program, max_miles=max_miles)
+        fare = FlightFare(miles=fare_miles, cash=50.0, cabin="business",
+                          booking_class="J", program=fare_program)
+        assert _fare_predicate(alert)(fare) is expected
+
 
 # ---------------------------------------------------------------------------
 # fire_alert / webhook tests
@@ -253,6 +467,28 @@ class TestFireAlert:
 
         assert result is True
 
+    def test_send_webhook_posts_embed_over_shared_client(self, monkeypatch):
+        import httpx
+        from wombat_miles import alerts
+
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(204 if len(requests) == 1 else 500)
+
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr("wombat_miles.alerts._HTTP", client)
+
+        t = self._make_triggered()
+        assert alerts._send_webhook("https://discord.com/api/webhooks/fake", t) is True
+        assert alerts._send_webhook("https://discord.com/api/webhooks/fake", t) is False
+        assert alerts._http_client() is client
+
+        payload = json.loads(requests[0].content)
+        assert payload["embeds"][0]["title"].startswith("🦘 Award Alert: SFO → NRT")
+        assert requests[0].headers["Content-Type"] == "application/json"
+
     def test_no_webhook_configured(self):
         from wombat_miles import alerts
 
@@ -273,6 +509,23 @@ class TestFireAlert:
         assert history[0]["miles"] == 65_000
         assert history[0]["cabin"] == "business"
 
+    def test_prune_history_drops_old_rows(self):
+        from wombat_miles import alerts
+
+        t = self._make_triggered()
+        t.alert.webhooks = []
+        alerts.fire_alerts([t, t])
+        conn = alerts._get_conn()
+        with conn:
+            conn.execute(
+                "UPDATE alert_history SET fired_at = ? WHERE id = 1",
+                (time.time() - 100 * 86400,),
+            )
+
+        assert alerts.prune_history(days=90) == 1
+        assert len(alerts.get_alert_history()) == 1
+        assert alerts.prune_history(days=90) == 0
+
 
 # ---------------------------------------------------------------------------
 # build_discord_embed tests
@@ -313,6 +566,22 @@ class TestBuildDiscordEmbed:
         assert "color" in embed
         assert "footer" in embed
 
+    def test_shared_timestamp(self):
+        from wombat_miles.alerts import build_discord_embed
+
+        embed = build_discord_embed(self._make_triggered(), timestamp="2025-06-01T00:00:00Z")
+        assert embed["timestamp"] == "2025-06-01T00:00:00Z"
+        assert build_discord_embed(self._make_triggered())["timestamp"].endswith("Z")
+
+    def test_webhook_payload_is_json_bytes(self):
+        from wombat_miles import alerts
+
+        t = self._make_triggered(is_new_low=True)
+        ts = "2025-06-01T00:00:00Z"
+        payload = alerts._webhook_payload(t, ts)
+        assert isinstance(payload, bytes)
+        assert json.loads(payload) == {"embeds": [alerts.build_discord_embed(t, ts)]}
+
     def test_new_low_flag(self):
         from wombat_miles.alerts import build_discord_embed
 
@@ -332,6 +601,15 @@ class TestBuildDiscordEmbed:
         embed = build_discord_embed(self._make_triggered())
         assert "65,000" in embed["description"]
 
+    def test_derived_fields_precomputed(self):
+        from wombat_miles.alerts import build_discord_embed
+
+        t = self._make_triggered(is_new_low=True)
+        assert t.drop_pct == 9.7
+        assert (t.dep_hhmm, t.arr_hhmm) == ("10:00", "14:00")
+        assert "⏰ 10:00 → 14:00" in build_discord_embed(t)["description"]
+        assert self._make_triggered().drop_pct is None
+
 
 # ---------------------------------------------------------------------------
 # Alert.description property
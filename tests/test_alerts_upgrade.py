@@ -4,6 +4,7 @@ Tests for Phase 12: Alert system upgrade (SMTP + multiple webhooks).
 
 import json
 import tempfile
+import threading
 import time
 from pathlib import Path
 from unittest.mock import MagicMock, patch
@@ -23,6 +24,7 @@ def temp_db():
         alerts.ALERTS_DIR = Path(tmpdir)
         alerts.ALERTS_DB = Path(tmpdir) / "alerts.db"
         yield
+        alerts._reset_pool()
         alerts.ALERTS_DIR = orig_dir
         alerts.ALERTS_DB = orig_db
 
@@ -221,6 +223,113 @@ def test_fire_alert_multiple_webhooks(temp_db):
         
         assert success is True
         assert mock_send.call_count == 2
+        # Both webhooks get the same pre-encoded embed body
+        payloads = {c.args[2] for c in mock_send.call_args_list}
+        assert len(payloads) == 1
+        assert b'"embeds"' in payloads.pop()
+
+
+def test_fire_alert_sends_webhooks_concurrently(temp_db):
+    """Webhooks are sent in parallel, not one after another."""
+    alert_id = alerts.add_alert(
+        "SFO", "NRT",
+        webhooks=["https://discord.com/webhook1", "https://slack.com/webhook2"],
+    )
+    alert = alerts.get_alert(alert_id)
+
+    triggered = alerts.TriggeredAlert(
+        alert=alert,
+        flight_no="AS 1234",
+        origin="SFO",
+        destination="NRT",
+        flight_date="2025-06-01",
+        departure="2025-06-01T10:00:00",
+        arrival="2025-06-02T14:00:00",
+        duration=660,
+        cabin="business",
+        program="alaska",
+        miles=65000,
+        taxes_usd=120.50,
+    )
+
+    # Both sends must be in flight at once to pass the barrier
+    barrier = threading.Barrier(2, timeout=5)
+
+    def send(url, t, payload=None):
+        barrier.wait()
+        return True
+
+    with patch("wombat_miles.alerts._send_webhook", side_effect=send):
+        assert alerts.fire_alert(triggered) is True
+
+
+def test_fire_alerts_batch_sends_across_alerts_concurrently(temp_db):
+    """One batch sends every alert's webhooks in parallel and records each fire."""
+    triggered = []
+    for i, dest in enumerate(["NRT", "HND", "ICN"]):
+        alert = alerts.get_alert(
+            alerts.add_alert("SFO", dest, webhooks=[f"https://discord.com/webhook{i}"])
+        )
+        triggered.append(alerts.TriggeredAlert(
+            alert=alert, flight_no=f"AS {i}", origin="SFO", destination=dest,
+            flight_date="2025-06-01", departure="2025-06-01T10:00:00",
+            arrival="2025-06-02T14:00:00", duration=660, cabin="business",
+            program="alaska", miles=65000, taxes_usd=120.50,
+        ))
+
+    barrier = threading.Barrier(3, timeout=5)
+
+    def send(url, t, payload=None):
+        barrier.wait()
+        return not url.endswith("webhook1")
+
+    with patch("wombat_miles.alerts._send_webhook", side_effect=send):
+        assert alerts.fire_alerts(triggered) == [True, False, True]
+
+    # Recorded together: one transaction, one shared fired_at
+    history = alerts.get_alert_history()
+    assert len(history) == 3
+    assert len({h["fired_at"] for h in history}) == 1
+    assert not alerts._get_conn().in_transaction
+
+
+def test_fire_alerts_sender_exception_still_records_history(temp_db):
+    """A sender that raises fails only its own alert; history is still written."""
+    triggered = []
+    for i, dest in enumerate(["NRT", "HND"]):
+        alert = alerts.get_alert(
+            alerts.add_alert("SFO", dest, webhooks=[f"https://discord.com/webhook{i}"])
+        )
+        triggered.append(alerts.TriggeredAlert(
+            alert=alert, flight_no=f"AS {i}", origin="SFO", destination=dest,
+            flight_date="2025-06-01", departure="2025-06-01T10:00:00",
+            arrival="2025-06-02T14:00:00", duration=660, cabin="business",
+            program="alaska", miles=65000, taxes_usd=120.50,
+        ))
+
+    def send(url, t, payload=None):
+        if url.endswith("webhook0"):
+            raise alerts.httpx.InvalidURL("bad stored webhook")
+        return True
+
+    with patch("wombat_miles.alerts._send_webhook", side_effect=send):
+        assert alerts.fire_alerts(triggered) == [False, True]
+
+    assert len(alerts.get_alert_history()) == 2
+
+
+def test_fire_alerts_dry_run_sends_nothing(temp_db):
+    alert = alerts.get_alert(alerts.add_alert("SFO", "NRT", webhooks=["https://discord.com/w"]))
+    t = alerts.TriggeredAlert(
+        alert=alert, flight_no="AS 1", origin="SFO", destination="NRT",
+        flight_date="2025-06-01", departure="2025-06-01T10:00:00",
+        arrival="2025-06-02T14:00:00", duration=660, cabin="business",
+        program="alaska", miles=65000, taxes_usd=120.50,
+    )
+    with patch("wombat_miles.alerts._send_webhook") as mock_send:
+        assert alerts.fire_alerts([t, t], dry_run=True) == [True, True]
+        mock_send.assert_not_called()
+    assert len(alerts.get_alert_history()) == 2
 
 
 def test_fire_alert_email(temp_db):
@@ -261,6 +370,91 @@ def test_fire_alert_email(temp_db):
         assert mock_send.call_count == 1
 
 
+def _email_triggered(email_to):
+    alerts.add_email_config("test", "smtp.test.com", 587, "user", "pass", "from@test.com")
+    alert_id = alerts.add_alert("SFO", "NRT", email_to=email_to, email_config="test")
+    return alerts.TriggeredAlert(
+        alert=alerts.get_alert(alert_id),
+        flight_no="AS 1234",
+        origin="SFO",
+        destination="NRT",
+        flight_date="2025-06-01",
+        departure="2025-06-01T10:00:00",
+        arrival="2025-06-02T14:00:00",
+        duration=660,
+        cabin="business",
+        program="alaska",
+        miles=65000,
+        taxes_usd=120.50,
+    )
+
+
+def test_smtp_session_reused_across_sends(temp_db, monkeypatch):
+    """One SMTP login serves every email sent with the same config."""
+    monkeypatch.setattr(alerts, "_SMTP_SESSIONS", {})
+    triggered = _email_triggered(["a@example.com", "b@example.com"])
+
+    with patch("wombat_miles.alerts.smtplib.SMTP") as mock_smtp:
+        server = mock_smtp.return_value
+        server.noop.return_value = (250, b"OK")
+        assert alerts.fire_alert(triggered) is True
+        assert alerts.fire_alert(triggered) is True
+
+        assert mock_smtp.call_count == 1
+        assert server.login.call_count == 1
+        assert server.send_message.call_count == 4
+        alerts._close_smtp_sessions()
+
+
+def test_smtp_session_reconnects_when_stale(temp_db, monkeypatch):
+    """A pooled session that fails NOOP is replaced with a fresh login."""
+    monkeypatch.setattr(alerts, "_SMTP_SESSIONS", {})
+    triggered = _email_triggered(["a@example.com"])
+
+    with patch("wombat_miles.alerts.smtplib.SMTP") as mock_smtp:
+        stale, fresh = MagicMock(), MagicMock()
+        stale.noop.side_effect = alerts.smtplib.SMTPServerDisconnected()
+        mock_smtp.side_effect = [stale, fresh]
+
+        assert alerts.fire_alert(triggered) is True
+        assert alerts.fire_alert(triggered) is True
+
+        assert mock_smtp.call_count == 2
+        fresh.send_message.assert_called_once()
+        alerts._close_smtp_sessions()
+
+
+def test_failed_send_does_not_drop_reconnected_session(temp_db, monkeypatch):
+    """A send failing while another is queued only discards its own session."""
+    monkeypatch.setattr(alerts, "_SMTP_SESSIONS", {})
+    triggered = _email_triggered(["a@example.com", "b@example.com"])
+
+    with patch("wombat_miles.alerts.smtplib.SMTP") as mock_smtp:
+        broken, fresh = MagicMock(), MagicMock()
+
+        def fail_after_other_send_queues(msg):
+            time.sleep(0.05)  # let the other worker block on the config lock
+            raise alerts.smtplib.SMTPServerDisconnected()
+
+        broken.send_message.side_effect = fail_after_other_send_queues
+        fresh.noop.return_value = (250, b"OK")
+        mock_smtp.side_effect = [broken, fresh]
+
+        # Two recipients -> both sends run concurrently on the notify pool
+        assert alerts.fire_alert(triggered) is True
+
+        assert mock_smtp.call_count == 2
+        broken.quit.assert_called_once()
+        fresh.send_message.assert_called_once()
+        fresh.quit.assert_not_called()
+        assert alerts._SMTP_SESSIONS["test"] is fresh
+
+        # A late drop for the failed session leaves the live one pooled
+        alerts._drop_smtp_session("test", broken)
+        assert alerts._SMTP_SESSIONS["test"] is fresh
+        alerts._close_smtp_sessions()
+
+
 def test_fire_alert_webhook_and_email(temp_db):
     """Test firing an alert with both webhook and email."""
     alerts.add_email_config("test", "smtp.test.com", 587, "user", "pass", "from@test.com")
@@ -440,12 +634,11 @@ def test_migration_from_old_discord_webhook_field(temp_db):
     """)
     conn.commit()
     
-    # Now migrate (happens automatically on next _get_conn call)
-    conn.close()
-    conn = alerts._get_conn()
-    conn.close()
+    # Now migrate (happens automatically when the connection is reopened)
+    alerts._reset_pool()
+    alerts._get_conn()
     
-    # Read back via list_alerts (which uses _row_to_alert)
+    # Read back via list_alerts (which uses _rows_to_alerts)
     alert_list = alerts.list_alerts()
     assert len(alert_list) > 0
     
@@ -454,3 +647,109 @@ def test_migration_from_old_discord_webhook_field(temp_db):
     # and we can read alerts successfully
     assert all(isinstance(a.webhooks, list) for a in alert_list)
     assert all(isinstance(a.email_to, list) for a in alert_list)
+
+
+def test_file_db_uses_wal(temp_db):
+    """On-disk alert databases are opened in WAL mode."""
+    conn = alerts._get_conn()
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_prune_history_returns_freed_pages(temp_db):
+    """Pruning vacuums every freed page, not just one."""
+    conn = alerts._get_conn()
+    old = time.time() - 100 * 86400
+    with conn:
+        conn.executemany(
+            alerts._SQL_RECORD_FIRE,
+            [(1, "AS 1", "2025-06-01", "business", "alaska", 65_000, 85.0, 0, old)] * 5_000,
+        )
+    pages_before = conn.execute("PRAGMA page_count").fetchone()[0]
+
+    assert alerts.prune_history(days=90) == 5_000
+    assert conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+    assert conn.execute("PRAGMA page_count").fetchone()[0] < pages_before // 2
+
+
+def test_alert_prune_command(temp_db):
+    """`alert prune` deletes old history and reports the count."""
+    from typer.testing import CliRunner
+    from wombat_miles.cli import app
+
+    conn = alerts._get_conn()
+    with conn:
+        conn.executemany(
+            alerts._SQL_RECORD_FIRE,
+            [
+                (1, "AS 1", "2025-06-01", "business", "alaska", 65_000, 85.0, 0, fired_at)
+                for fired_at in (time.time() - 40 * 86400, time.time())
+            ],
+        )
+
+    result = CliRunner().invoke(app, ["alert", "prune", "--days", "30"])
+    assert result.exit_code == 0, result.output
+    assert "Pruned 1 alert history rows" in result.output
+    assert len(alerts.get_alert_history()) == 1
+
+
+def test_monitor_fires_each_route_as_it_is_checked(temp_db, monkeypatch, tmp_path):
+    """`monitor` fires and records each route's alerts as one batch."""
+    from typer.testing import CliRunner
+    from wombat_miles import cli, price_history
+
+    monkeypatch.setattr(price_history, "HISTORY_DIR", tmp_path)
+    monkeypatch.setattr(price_history, "HISTORY_FILE", ":memory:")
+    alerts.add_alert("SFO", "NRT", webhooks=["https://hook.example/1"])
+    alerts.add_alert("LAX", "LHR", webhooks=["https://hook.example/2"])
+
+    async def fake_search(scrapers, origin, destination, dates, **kwargs):
+        fare = FlightFare(miles=60_000, cash=80.0, cabin="business",
+                          booking_class="J", program="alaska")
+        flight = Flight(flight_no="AS 1", origin=origin, destination=destination,
+                        departure="2025-06-01 10:00:00", arrival="2025-06-02 14:00:00",
+                        duration=600, aircraft="789", fares=[fare])
+        return [SearchResult(origin=origin, destination=destination,
+                             date="2025-06-01", flights=[flight])]
+
+    monkeypatch.setattr(cli, "_get_scrapers", lambda program: [])
+    monkeypatch.setattr(cli, "_search_dates_concurrent", fake_search)
+    try:
+        with patch("wombat_miles.alerts.fire_alerts", wraps=alerts.fire_alerts) as fire, \
+                patch("wombat_miles.alerts._send_webhook", return_value=True):
+            result = CliRunner().invoke(cli.app, ["monitor", "--days", "1"])
+    finally:
+        price_history._reset_pool()
+
+    assert result.exit_code == 0, result.output
+    assert [[t.origin for t in c.args[0]] for c in fire.call_args_list] == [["SFO"], ["LAX"]]
+    assert "2 alert(s) triggered, 2 Discord notification(s) sent" in result.output
+    assert len(alerts.get_alert_history()) == 2
+
+
+def test_migration_from_json_columns_to_child_tables(temp_db):
+    """JSON-array webhooks/email_to columns are moved into the child tables."""
+    conn = alerts._get_conn()
+    conn.execute("""
+        INSERT INTO alerts (origin, destination, webhooks, email_to)
+        VALUES ('SFO', 'NRT', '["https://a.example", "https://b.example"]', '["x@test.com"]')
+    """)
+    conn.commit()
+
+    alerts._reset_pool()
+    alert = alerts.list_alerts()[0]
+    assert alert.webhooks == ["https://a.example", "https://b.example"]
+    assert alert.email_to == ["x@test.com"]
+
+    # Re-opening does not duplicate migrated rows
+    alerts._reset_pool()
+    assert alerts.get_alert(alert.id).webhooks == ["https://a.example", "https://b.example"]
+
+
+def test_remove_alert_deletes_targets(temp_db):
+    """Removing an alert also removes its webhook and email rows."""
+    alert_id = alerts.add_alert("SFO", "NRT", webhooks=["url"], email_to=["a@test.com"])
+    assert alerts.remove_alert(alert_id)
+
+    conn = alerts._get_conn()
+    assert conn.execute("SELECT COUNT(*) FROM alert_webhooks").fetchone()[0] == 0
+    assert conn.execute("SELECT COUNT(*) FROM alert_emails").fetchone()[0] == 0
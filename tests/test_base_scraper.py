@@ -0,0 +1,64 @@
+"""Tests for the BaseScraper helpers."""
+
+import asyncio
+from typing import Optional
+
+from wombat_miles.models import Flight
+from wombat_miles.scrapers.base import BaseScraper
+
+
+class FakeScraper(BaseScraper):
+    """Records calls and peak concurrency instead of launching a browser."""
+
+    def __init__(self):
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+
+    @property
+    def program_name(self) -> str:
+        return "fake"
+
+    async def search(
+        self,
+        origin: str,
+        destination: str,
+        date: str,
+        cabin: Optional[str] = None,
+        max_stops: int = 0,
+    ) -> list[Flight]:
+        self.calls.append((origin, destination, date, cabin, max_stops))
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        return [
+            Flight(
+                flight_no="XX 1",
+                origin=origin,
+                destination=destination,
+                departure=f"{date} 10:00:00",
+                arrival=f"{date} 14:00:00",
+                duration=240,
+                aircraft="789",
+            )
+        ]
+
+
+def test_search_many_preserves_route_order():
+    scraper = FakeScraper()
+    routes = [("SFO", "NRT", "2025-06-01"), ("LAX", "HND", "2025-06-02"), ("SEA", "ICN", "2025-06-03")]
+    results = asyncio.run(scraper.search_many(routes, cabin="business", max_stops=1))
+
+    assert [r[0].origin for r in results] == ["SFO", "LAX", "SEA"]
+    assert [r[0].destination for r in results] == ["NRT", "HND", "ICN"]
+    assert all(call[3:] == ("business", 1) for call in scraper.calls)
+
+
+def test_search_many_respects_concurrency():
+    scraper = FakeScraper()
+    routes = [("SFO", "NRT", f"2025-06-{d:02d}") for d in range(1, 9)]
+    results = asyncio.run(scraper.search_many(routes, concurrency=2))
+
+    assert len(results) == 8
+    assert scraper.peak == 2
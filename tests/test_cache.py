@@ -1,9 +1,6 @@
 """Tests for cache module."""
 
-import sys
-import os
 import time
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
 from wombat_miles import cache
 
@@ -35,6 +32,17 @@ def test_make_key():
     assert key == "alaska_SFO_LAX_2025-03-20"
 
 
+def test_stored_keys_are_fixed_length_digests():
+    """Keys are stored as 16-byte blake2b digests regardless of length."""
+    key = cache.make_key("aeroplan", "sfo", "yyz", "2025-03-20")
+    cache.set(key, "data", ttl=3600)
+    row = cache._get_conn().execute(
+        "SELECT key FROM cache WHERE key = ?", (cache._key_digest(key),)
+    ).fetchone()
+    assert row is not None
+    assert isinstance(row[0], bytes) and len(row[0]) == 16
+
+
 def test_clear_all():
     """Test clearing all cache."""
     cache.set("test_clear_1", "data1", ttl=3600)
@@ -55,11 +63,58 @@ def test_clear_expired():
     assert cache.get("test_stale") is None
 
 
+def test_clear_expired_uses_index():
+    """The expiry sweep is an index range delete, not a table scan."""
+    plan = cache._get_conn().execute(
+        "EXPLAIN QUERY PLAN DELETE FROM cache WHERE expires_at < ?", (time.time(),)
+    ).fetchall()
+    assert any("idx_cache_exp" in row[3] for row in plan)
+
+
+def test_get_after_reopen():
+    """Values survive dropping the in-process mirror and reloading from disk."""
+    cache.set("test_reopen", [1, 2, 3], ttl=3600)
+    cache._reset_pool()
+    assert cache.get("test_reopen") == [1, 2, 3]
+
+
+def test_get_returns_fresh_copy():
+    """Mutating a returned value does not change the cached entry."""
+    cache.set("test_copy", {"miles": 50000}, ttl=3600)
+    cache.get("test_copy")["miles"] = 1
+    assert cache.get("test_copy") == {"miles": 50000}
+
+
+def test_connection_pool_is_per_thread():
+    """Each thread gets its own connection; a thread reuses its own."""
+    import threading
+
+    main_conn = cache._get_conn()
+    assert cache._get_conn() is main_conn
+    seen = []
+
+    def use_cache():
+        cache.set("test_thread", "worker", ttl=3600)
+        seen.append(cache._get_conn())
+        cache._POOL.reset()  # close the worker's connection, keep the shared mirror
+
+    worker = threading.Thread(target=use_cache)
+    worker.start()
+    worker.join()
+    assert seen[0] is not main_conn
+    assert cache.get("test_thread") == "worker"
+
+
 if __name__ == "__main__":
     test_set_get()
     test_get_missing()
     test_expired()
     test_make_key()
+    test_stored_keys_are_fixed_length_digests()
     test_clear_all()
     test_clear_expired()
+    test_clear_expired_uses_index()
+    test_get_after_reopen()
+    test_get_returns_fresh_copy()
+    test_connection_pool_is_per_thread()
     print("✅ All cache tests passed!")
@@ -1,8 +1,7 @@
 """Tests for calendar view formatter."""
 
 import pytest
-from unittest.mock import patch
-from io import StringIO
+from rich.console import Console
 
 from wombat_miles.formatter import print_calendar_view
 from wombat_miles.models import Flight, FlightFare, SearchResult
@@ -53,6 +52,24 @@ def make_empty_result(date_str: str) -> SearchResult:
     )
 
 
+@pytest.fixture(scope="module")
+def plain_console() -> Console:
+    """One colorless 80-column console shared by the rendering tests."""
+    return Console(no_color=True, width=80)
+
+
+@pytest.fixture
+def render_calendar(plain_console):
+    """Render print_calendar_view without color and return the output text."""
+
+    def render(*args, **kwargs) -> str:
+        with plain_console.capture() as cap:
+            print_calendar_view(*args, out=plain_console, **kwargs)
+        return cap.get()
+
+    return render
+
+
 # ── Basic rendering ──────────────────────────────────────────────────────────
 
 
@@ -67,15 +84,9 @@ def test_calendar_view_renders_without_error(capsys):
     print_calendar_view(results, cabin_filter="business", origin="SFO", destination="NRT")
 
 
-def test_calendar_view_empty_results(capsys):
+def test_calendar_view_empty_results(capsys, render_calendar):
     """Empty results should print a graceful 'no results' message."""
-    from rich.console import Console
-    from io import StringIO
-
-    buf = StringIO()
-    with patch("wombat_miles.formatter.console", Console(file=buf, no_color=True)):
-        print_calendar_view([], cabin_filter="business")
-    output = buf.getvalue()
+    output = render_calendar([], cabin_filter="business")
     assert "No results" in output
 
 
@@ -109,7 +120,7 @@ def test_single_date_renders():
 # ── Multi-month support ──────────────────────────────────────────────────────
 
 
-def test_multi_month_calendar():
+def test_multi_month_calendar(render_calendar):
     """Dates spanning two months should produce two separate calendar tables."""
     results = [
         make_result("2025-06-28", 55_000),
@@ -117,13 +128,7 @@ def test_multi_month_calendar():
         make_result("2025-07-01", 60_000),
         make_result("2025-07-02", 62_000),
     ]
-    from rich.console import Console
-    from io import StringIO
-
-    buf = StringIO()
-    with patch("wombat_miles.formatter.console", Console(file=buf, no_color=True)):
-        print_calendar_view(results, cabin_filter="business", origin="SFO", destination="NRT")
-    output = buf.getvalue()
+    output = render_calendar(results, cabin_filter="business", origin="SFO", destination="NRT")
     # Both months should appear in the title
     assert "June 2025" in output
     assert "July 2025" in output
@@ -132,45 +137,33 @@ def test_multi_month_calendar():
 # ── Summary footer ───────────────────────────────────────────────────────────
 
 
-def test_summary_shows_best_price(capsys):
+def test_summary_shows_best_price(capsys, render_calendar):
     """Summary footer should identify the cheapest date."""
     results = [
         make_result("2025-06-05", 55_000),
         make_result("2025-06-10", 45_000),  # best
         make_result("2025-06-20", 70_000),
     ]
-    from rich.console import Console
-    from io import StringIO
-
-    buf = StringIO()
-    with patch("wombat_miles.formatter.console", Console(file=buf, no_color=True)):
-        print_calendar_view(results, cabin_filter="business", origin="SFO", destination="NRT")
-    output = buf.getvalue()
+    output = render_calendar(results, cabin_filter="business", origin="SFO", destination="NRT")
     assert "2025-06-10" in output
     assert "45,000" in output
 
 
-def test_summary_count():
+def test_summary_count(render_calendar):
     """Summary should show correct fraction of days with availability."""
     results = [
         make_result("2025-06-01", 55_000),
         make_empty_result("2025-06-02"),
         make_empty_result("2025-06-03"),
     ]
-    from rich.console import Console
-    from io import StringIO
-
-    buf = StringIO()
-    with patch("wombat_miles.formatter.console", Console(file=buf, no_color=True)):
-        print_calendar_view(results, cabin_filter="business", origin="SFO", destination="NRT")
-    output = buf.getvalue()
+    output = render_calendar(results, cabin_filter="business", origin="SFO", destination="NRT")
     assert "1/3" in output
 
 
 # ── Cabin filtering ──────────────────────────────────────────────────────────
 
 
-def test_cabin_filter_excludes_wrong_cabin():
+def test_cabin_filter_excludes_wrong_cabin(render_calendar):
     """With business filter, economy-only flights should not appear as available."""
     eco_result = SearchResult(
         origin="SFO",
@@ -179,18 +172,12 @@ def test_cabin_filter_excludes_wrong_cabin():
         flights=[make_flight("2025-06-10", 25_000, cabin="economy")],
     )
     results = [eco_result]
-    from rich.console import Console
-    from io import StringIO
-
-    buf = StringIO()
-    with patch("wombat_miles.formatter.console", Console(file=buf, no_color=True)):
-        print_calendar_view(results, cabin_filter="business", origin="SFO", destination="NRT")
-    output = buf.getvalue()
+    output = render_calendar(results, cabin_filter="business", origin="SFO", destination="NRT")
     # With business filter, this date should show "–" (no biz fares)
     assert "0/1" in output
 
 
-def test_no_cabin_filter_shows_all():
+def test_no_cabin_filter_shows_all(render_calendar):
     """Without cabin filter, all fares should count toward availability."""
     result = SearchResult(
         origin="SFO",
@@ -199,20 +186,14 @@ def test_no_cabin_filter_shows_all():
         flights=[make_flight("2025-06-10", 25_000, cabin="economy")],
     )
     results = [result]
-    from rich.console import Console
-    from io import StringIO
-
-    buf = StringIO()
-    with patch("wombat_miles.formatter.console", Console(file=buf, no_color=True)):
-        print_calendar_view(results, cabin_filter=None, origin="SFO", destination="NRT")
-    output = buf.getvalue()
+    output = render_calendar(results, cabin_filter=None, origin="SFO", destination="NRT")
     assert "1/1" in output
 
 
 # ── Mixed programs ───────────────────────────────────────────────────────────
 
 
-def test_mixed_programs_picks_cheapest():
+def test_mixed_programs_picks_cheapest(render_calendar):
     """When multiple programs have availability, pick the cheapest."""
     result = SearchResult(
         origin="SFO",
@@ -223,13 +204,7 @@ def test_mixed_programs_picks_cheapest():
             make_flight("2025-06-10", 55_000, program="alaska"),
         ],
     )
-    from rich.console import Console
-    from io import StringIO
-
-    buf = StringIO()
-    with patch("wombat_miles.formatter.console", Console(file=buf, no_color=True)):
-        print_calendar_view([result], cabin_filter="business", origin="SFO", destination="NRT")
-    output = buf.getvalue()
+    output = render_calendar([result], cabin_filter="business", origin="SFO", destination="NRT")
     # Best price = 55k (alaska)
     assert "55" in output
     assert "alaska" in output
@@ -238,35 +213,32 @@ def test_mixed_programs_picks_cheapest():
 # ── Color threshold correctness ───────────────────────────────────────────────
 
 
-def test_color_threshold_n3_has_red():
+def test_color_threshold_n3_has_red(render_calendar):
     """With n=3 distinct prices, the most expensive should be reachable as red.
 
     Bug in original implementation: (2*3)//3 = 2, so high_thresh = max,
     making red unreachable. Fixed by capping high_idx at n-2.
     """
-    from rich.console import Console
-    from io import StringIO
-
     results = [
         make_result("2025-06-01", 30_000),   # cheap → green
         make_result("2025-06-02", 60_000),   # mid
         make_result("2025-06-03", 90_000),   # expensive → should be red
     ]
-    buf = StringIO()
-    with patch("wombat_miles.formatter.console", Console(file=buf, no_color=False)):
-        print_calendar_view(results, cabin_filter="business", origin="SFO", destination="NRT")
+    color_console = Console(force_terminal=True, width=80)
+    with color_console.capture():
+        print_calendar_view(
+            results, cabin_filter="business", origin="SFO", destination="NRT",
+            out=color_console,
+        )
     # We can't assert exact ANSI codes easily, but at least no exception
     # and all three dates appear
-    buf2 = StringIO()
-    with patch("wombat_miles.formatter.console", Console(file=buf2, no_color=True)):
-        print_calendar_view(results, cabin_filter="business", origin="SFO", destination="NRT")
-    output = buf2.getvalue()
+    output = render_calendar(results, cabin_filter="business", origin="SFO", destination="NRT")
     assert "30" in output  # day 1
     assert "60" in output  # day 2
     assert "90" in output  # day 3
 
 
-def test_color_threshold_n4_shows_variation():
+def test_color_threshold_n4_shows_variation(render_calendar):
     """With n=4, we should get green, yellow, and red tiers all possible."""
     results = [
         make_result("2025-06-01", 20_000),
@@ -275,32 +247,22 @@ def test_color_threshold_n4_shows_variation():
         make_result("2025-06-04", 80_000),
     ]
     # Should not raise and all 4 days should appear
-    from rich.console import Console
-    from io import StringIO
-    buf = StringIO()
-    with patch("wombat_miles.formatter.console", Console(file=buf, no_color=True)):
-        print_calendar_view(results, cabin_filter="business", origin="SFO", destination="NRT")
-    output = buf.getvalue()
+    output = render_calendar(results, cabin_filter="business", origin="SFO", destination="NRT")
     assert "20" in output
     assert "80" in output
 
 
-def test_color_threshold_n1_single_price():
+def test_color_threshold_n1_single_price(render_calendar):
     """Single price should show as green (cheap tier) without crashing."""
     results = [make_result("2025-06-15", 55_000)]
-    from rich.console import Console
-    from io import StringIO
-    buf = StringIO()
-    with patch("wombat_miles.formatter.console", Console(file=buf, no_color=True)):
-        print_calendar_view(results, cabin_filter="business", origin="SFO", destination="NRT")
-    output = buf.getvalue()
+    output = render_calendar(results, cabin_filter="business", origin="SFO", destination="NRT")
     assert "55" in output
 
 
 # ── Year boundary (Dec → Jan) ─────────────────────────────────────────────────
 
 
-def test_year_boundary_december_to_january():
+def test_year_boundary_december_to_january(render_calendar):
     """Calendar results spanning December and January should render both months."""
     results = [
         make_result("2025-12-30", 55_000),
@@ -308,12 +270,7 @@ def test_year_boundary_december_to_january():
         make_result("2026-01-01", 60_000),
         make_result("2026-01-02", 62_000),
     ]
-    from rich.console import Console
-    from io import StringIO
-    buf = StringIO()
-    with patch("wombat_miles.formatter.console", Console(file=buf, no_color=True)):
-        print_calendar_view(results, cabin_filter="business", origin="SFO", destination="NRT")
-    output = buf.getvalue()
+    output = render_calendar(results, cabin_filter="business", origin="SFO", destination="NRT")
     assert "December 2025" in output
     assert "January 2026" in output
 
@@ -336,3 +293,32 @@ def test_month_advance_cross_year():
 
     assert dates[0] == (2025, 12, 31)   # December 2025
     assert dates[1] == (2026, 1, 31)    # January 2026 (not December again!)
+
+
+# ── Cached helpers ───────────────────────────────────────────────────────────
+
+
+def test_month_grid_cells():
+    """Grid cells carry the ISO date string; padding days are (0, '')."""
+    from wombat_miles.formatter import _month_grid
+
+    weeks = _month_grid(2025, 6)  # June 2025 starts on a Sunday
+    assert weeks[0][:6] == ((0, ""),) * 6
+    assert weeks[0][6] == (1, "2025-06-01")
+    assert weeks[-1][0] == (30, "2025-06-30")
+    assert _month_grid(2025, 6) is weeks  # cached
+
+
+@pytest.mark.parametrize(
+    "prices,expected",
+    [
+        ((), (0, 0)),
+        ((50000,), (50000, 50000)),
+        ((30000, 50000, 70000), (50000, 50000)),
+        ((40000, 30000, 60000, 50000), (40000, 50000)),
+    ],
+)
+def test_price_thresholds(prices, expected):
+    from wombat_miles.formatter import _price_thresholds
+
+    assert _price_thresholds(prices) == expected
@@ -38,9 +38,8 @@ def make_flight(
     )
 
 
-def test_find_connections_basic():
+def test_find_connections_basic(base_time):
     """Test basic connection matching."""
-    base_time = datetime(2025, 6, 15, 8, 0)
     
     # SFO -> ICN (8:00-14:00, 6h flight)
     first_leg = [
@@ -65,10 +64,8 @@ def test_find_connections_basic():
     assert conn.total_duration_minutes == 6*60 + 4*60 + 180  # flight1 + flight2 + layover
 
 
-def test_find_connections_too_short_layover():
+def test_find_connections_too_short_layover(base_time):
     """Test that connections with too-short layover are rejected."""
-    base_time = datetime(2025, 6, 15, 8, 0)
-    
     first_leg = [
         make_flight("AS1", "SFO", "ICN", base_time, base_time + timedelta(hours=6), 60000)
     ]
@@ -83,10 +80,8 @@ def test_find_connections_too_short_layover():
     assert len(connections) == 0
 
 
-def test_find_connections_too_long_layover():
+def test_find_connections_too_long_layover(base_time):
     """Test that connections with too-long layover are rejected."""
-    base_time = datetime(2025, 6, 15, 8, 0)
-    
     first_leg = [
         make_flight("AS1", "SFO", "ICN", base_time, base_time + timedelta(hours=6), 60000)
     ]
@@ -101,10 +96,8 @@ def test_find_connections_too_long_layover():
     assert len(connections) == 0
 
 
-def test_find_connections_mismatched_airports():
+def test_find_connections_mismatched_airports(base_time):
     """Test that connections with mismatched airports are rejected."""
-    base_time = datetime(2025, 6, 15, 8, 0)
-    
     # First leg ends at ICN
     first_leg = [
         make_flight("AS1", "SFO", "ICN", base_time, base_time + timedelta(hours=6), 60000)
@@ -120,10 +113,8 @@ def test_find_connections_mismatched_airports():
     assert len(connections) == 0
 
 
-def test_find_connections_multiple_options():
+def test_find_connections_multiple_options(base_time):
     """Test with multiple flights on each leg."""
-    base_time = datetime(2025, 6, 15, 8, 0)
-    
     first_leg = [
         make_flight("AS1", "SFO", "ICN", base_time, base_time + timedelta(hours=6), 60000),
         make_flight("AS3", "SFO", "ICN", base_time + timedelta(hours=2), base_time + timedelta(hours=8), 55000),
@@ -149,10 +140,8 @@ def test_find_connections_multiple_options():
     assert connections[2].total_miles == 92000  # AS1 + AS4 (60k + 32k)
 
 
-def test_find_connections_cabin_filter():
+def test_find_connections_cabin_filter(base_time):
     """Test cabin filtering."""
-    base_time = datetime(2025, 6, 15, 8, 0)
-    
     # First leg has both economy and business
     first_leg = [
         Flight(
@@ -183,10 +172,8 @@ def test_find_connections_cabin_filter():
     assert connections[0].total_miles == 90000  # 60k + 30k (business fares)
 
 
-def test_find_connections_no_matching_cabin():
+def test_find_connections_no_matching_cabin(base_time):
     """Test when no flights match the cabin filter."""
-    base_time = datetime(2025, 6, 15, 8, 0)
-    
     first_leg = [
         make_flight("AS1", "SFO", "ICN", base_time, base_time + timedelta(hours=6), 60000, cabin="business")
     ]
@@ -210,11 +197,10 @@ def test_format_duration():
     assert format_duration(0) == "0m"
 
 
-def test_connection_itinerary_properties():
+def test_connection_itinerary_properties(base_time):
     """Test ConnectionItinerary properties."""
     from wombat_miles.connection import ConnectionItinerary
     
-    base_time = datetime(2025, 6, 15, 8, 0)
     first = make_flight("AS1", "SFO", "ICN", base_time, base_time + timedelta(hours=6), 60000)
     second = make_flight("AS2", "ICN", "BKK", base_time + timedelta(hours=9), base_time + timedelta(hours=13), 30000)
     
@@ -234,12 +220,89 @@ def test_connection_itinerary_properties():
     assert conn.arrival == base_time + timedelta(hours=13)
 
 
-def test_find_connections_empty_legs():
+def test_find_connections_empty_legs(base_time):
     """Test with empty flight lists."""
     assert find_connections([], [], min_layover_hours=2, max_layover_hours=24) == []
     
-    base_time = datetime(2025, 6, 15, 8, 0)
     first_leg = [make_flight("AS1", "SFO", "ICN", base_time, base_time + timedelta(hours=6), 60000)]
     
     assert find_connections(first_leg, [], min_layover_hours=2, max_layover_hours=24) == []
     assert find_connections([], first_leg, min_layover_hours=2, max_layover_hours=24) == []
+
+
+def test_find_connections_accepts_scraper_time_strings(base_time):
+    """Scraped flights carry 'YYYY-MM-DD HH:MM:SS' strings rather than datetimes."""
+    f1 = make_flight("AS1", "SFO", "ICN", base_time, base_time + timedelta(hours=6), 60000)
+    f2 = make_flight("AS2", "ICN", "BKK", base_time + timedelta(hours=9), base_time + timedelta(hours=13), 30000)
+    for f in (f1, f2):
+        f.departure = str(f.departure)
+        f.arrival = str(f.arrival)
+
+    connections = find_connections([f1], [f2], min_layover_hours=2, max_layover_hours=24)
+
+    assert len(connections) == 1
+    assert connections[0].layover_minutes == 180
+
+
+def test_find_connections_matches_brute_force():
+    """The windowed search returns exactly what checking every pair would."""
+    import random
+
+    rng = random.Random(7)
+    base_time = datetime(2025, 6, 15, 0, 0)
+    first_leg = [
+        make_flight(f"F{i}", "SFO", rng.choice(["ICN", "NRT"]),
+                    base_time + timedelta(hours=i), base_time + timedelta(hours=i + 6),
+                    rng.choice([50000, 60000, 70000]))
+        for i in range(20)
+    ]
+    second_leg = [
+        make_flight(f"S{i}", rng.choice(["ICN", "NRT"]), "BKK",
+                    base_time + timedelta(minutes=rng.randrange(0, 60 * 72)),
+                    base_time + timedelta(hours=80),
+                    rng.choice([20000, 30000]))
+        for i in range(40)
+    ]
+
+    expected = sorted(
+        (
+            (f1.flight_no, f2.flight_no)
+            for f1 in first_leg
+            for f2 in second_leg
+            if f1.destination == f2.origin
+            and timedelta(hours=2) <= f2.departure - f1.arrival <= timedelta(hours=12)
+        )
+    )
+    connections = find_connections(first_leg, second_leg, min_layover_hours=2, max_layover_hours=12)
+
+    assert sorted((c.first_segment.flight_no, c.second_segment.flight_no) for c in connections) == expected
+    assert [c.total_miles for c in connections] == sorted(c.total_miles for c in connections)
+
+
+def test_find_connections_cabin_filter_case_insensitive_and_cheapest(base_time):
+    """The cabin filter ignores case and picks the cheapest fare in that cabin."""
+    f1 = make_flight("AS1", "SFO", "ICN", base_time, base_time + timedelta(hours=6), 60000)
+    f1.fares = [
+        FlightFare(miles=70000, cash=50.0, cabin="business", booking_class="J", program="alaska"),
+        FlightFare(miles=20000, cash=30.0, cabin="economy", booking_class="Y", program="alaska"),
+        FlightFare(miles=55000, cash=90.0, cabin="business", booking_class="I", program="aeroplan"),
+    ]
+    f2 = make_flight("AS2", "ICN", "BKK", base_time + timedelta(hours=9), base_time + timedelta(hours=13), 30000)
+
+    connections = find_connections([f1], [f2], min_layover_hours=2, max_layover_hours=24, cabin="Business")
+
+    assert len(connections) == 1
+    assert connections[0].total_miles == 85000
+    assert connections[0].total_cash == 140.0
+
+
+def test_find_connections_matches_mixed_case_fare_cabins(base_time):
+    """Fare cabins are compared case-insensitively too, cheapest across spellings."""
+    f1 = make_flight("AS1", "SFO", "ICN", base_time, base_time + timedelta(hours=6), 60000, cabin="Business")
+    f1.fares.append(FlightFare(miles=50000, cash=20.0, cabin="BUSINESS", booking_class="I", program="aeroplan"))
+    f2 = make_flight("AS2", "ICN", "BKK", base_time + timedelta(hours=9), base_time + timedelta(hours=13), 30000, cabin="Business")
+
+    connections = find_connections([f1], [f2], min_layover_hours=2, max_layover_hours=24, cabin="business")
+
+    assert len(connections) == 1
+    assert connections[0].total_miles == 80000
@@ -0,0 +1,116 @@
+"""Tests for data models."""
+
+import dataclasses
+
+import pytest
+
+from wombat_miles.models import Flight, FlightFare, SearchResult
+
+
+def make_fare(miles: int, cabin: str, booking_class: str = "X") -> FlightFare:
+    return FlightFare(
+        miles=miles,
+        cash=5.6,
+        cabin=cabin,
+        booking_class=booking_class,
+        program="alaska",
+    )
+
+
+def make_flight(fares: list[FlightFare]) -> Flight:
+    return Flight(
+        flight_no="AS 1",
+        origin="SFO",
+        destination="LAX",
+        departure="2025-03-20 08:30:00",
+        arrival="2025-03-20 10:05:00",
+        duration=95,
+        aircraft="Boeing 737-900",
+        fares=fares,
+    )
+
+
+def test_fares_by_cabin_keeps_lowest():
+    """Each cabin maps to its lowest-miles fare."""
+    flight = make_flight([
+        make_fare(7500, "economy", "Y"),
+        make_fare(5000, "economy", "X"),
+        make_fare(15000, "business", "F"),
+    ])
+    assert set(flight.fares_by_cabin) == {"economy", "business"}
+    assert flight.fares_by_cabin["economy"].booking_class == "X"
+    assert flight.fares_by_cabin["business"].miles == 15000
+
+
+def test_fares_by_cabin_tracks_fare_changes():
+    """Reassigning or appending to fares invalidates the cached index."""
+    flight = make_flight([make_fare(15000, "business")])
+    assert flight.best_fare("economy") is None
+
+    flight.fares.append(make_fare(5000, "economy"))
+    assert flight.best_fare("economy").miles == 5000
+    assert flight.best_fare().miles == 5000
+
+    flight.fares = [make_fare(12000, "business")]
+    assert flight.best_fare("economy") is None
+    assert flight.best_fare("business").miles == 12000
+
+
+def test_fare_index_sees_in_place_replacement():
+    """Swapping a fare in place (same length) is not served from a stale index."""
+    flight = make_flight([make_fare(7500, "economy"), make_fare(15000, "business")])
+    assert flight.best_fare("economy").miles == 7500
+
+    flight.fares[0] = make_fare(5000, "economy")
+    assert flight.best_fare("economy").miles == 5000
+    assert flight.best_fare().miles == 5000
+
+
+def test_fare_index_built_lazily():
+    """Constructing a Flight does not build the index; the first lookup does."""
+    flight = make_flight([make_fare(5000, "economy")])
+    assert not hasattr(flight, "_fare_index") or flight._fare_index is None
+    flight.best_fare()
+    assert flight._fare_index is not None
+
+
+def test_getitem_by_cabin():
+    """flight[cabin] returns the indexed fare and raises KeyError if absent."""
+    flight = make_flight([make_fare(7500, "economy", "Y"), make_fare(5000, "economy", "X")])
+    assert flight["economy"].booking_class == "X"
+    with pytest.raises(KeyError):
+        flight["business"]
+
+
+def test_cabin_set():
+    """cabin_set lists the cabins present and follows fare changes."""
+    flight = make_flight([make_fare(7500, "economy"), make_fare(15000, "business")])
+    assert flight.cabin_set == frozenset({"economy", "business"})
+    assert "first" not in flight.cabin_set
+    flight.fares = []
+    assert flight.cabin_set == frozenset()
+
+
+def test_best_fare_ties_keep_first():
+    """Ties resolve to the first fare seen, like min()."""
+    first = make_fare(5000, "economy", "X")
+    flight = make_flight([make_fare(7000, "economy"), make_fare(5000, "business"), first])
+    assert flight.best_fare().cabin == "business"
+    assert flight.best_fare("economy") is first
+
+
+def test_index_not_serialized():
+    """The cached index never leaks into asdict() or the cache round-trip."""
+    flight = make_flight([make_fare(5000, "economy")])
+    flight.best_fare()
+    d = dataclasses.asdict(flight)
+    assert "_fare_index" not in d
+    fares = [FlightFare(**fa) for fa in d.pop("fares")]
+    assert Flight(**d, fares=fares) == flight
+
+
+def test_search_result_is_slotted():
+    result = SearchResult("SFO", "NRT", "2025-06-01")
+    assert not hasattr(result, "__dict__")
+    result.flights.append(make_flight([make_fare(5000, "economy")]))
+    assert len(result.flights) == 1
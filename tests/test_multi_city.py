@@ -278,3 +278,56 @@ def test_multi_city_multiple_dates():
 
     finally:
         formatter.console = original_console
+
+
+def test_multi_city_results_written_in_one_batch(mock_multi_city_results, monkeypatch):
+    """The whole report is buffered and reaches the terminal in a single write."""
+    writes = []
+
+    class CountingIO(StringIO):
+        def write(self, s):
+            writes.append(s)
+            return super().write(s)
+
+    from wombat_miles import formatter
+    monkeypatch.setattr(formatter, "console", Console(file=CountingIO(), width=120))
+
+    print_multi_city_results(
+        mock_multi_city_results,
+        cabin_filter="business",
+        destination="NRT",
+        search_date="2025-06-01",
+    )
+
+    assert len(writes) == 1
+    assert "Best Options by Origin" in writes[0]
+    assert "total option(s)" in writes[0]
+
+
+def test_multi_city_summary_counts_all_options(monkeypatch):
+    """The summary's Flights column counts every matching fare for the origin.
+
+    Before the single-pass rewrite this read 1 for every origin: the count was
+    captured when the best fare was seen, which after sorting was always first.
+    """
+    def flight(no, miles):
+        return Flight(
+            flight_no=no, origin="SFO", destination="NRT",
+            departure="2025-06-01T10:00", arrival="2025-06-02T14:00",
+            duration=600, aircraft="787",
+            fares=[FlightFare(miles=miles, cash=50.0, cabin="business",
+                              booking_class="J", program="alaska")],
+        )
+
+    results = {"SFO": [SearchResult("SFO", "NRT", "2025-06-01",
+                                    [flight("AS 1", 70_000), flight("AS 2", 60_000),
+                                     flight("AS 3", 80_000)])]}
+    string_io = StringIO()
+    from wombat_miles import formatter
+    monkeypatch.setattr(formatter, "console", Console(file=string_io, width=200))
+
+    print_multi_city_results(results, destination="NRT", search_date="2025-06-01")
+
+    summary_row = next(line for line in string_io.getvalue().splitlines()
+                       if "SFO" in line and "60,000" in line)
+    assert summary_row.rstrip(" │").endswith("3")
@@ -17,10 +17,11 @@ from wombat_miles.models import Flight, FlightFare, SearchResult
 
 @pytest.fixture(autouse=True)
 def use_temp_db(tmp_path, monkeypatch):
-    """Redirect price history to a temporary directory for each test."""
+    """Give each test its own in-memory price history DB (dropped on teardown)."""
     monkeypatch.setattr(ph, "HISTORY_DIR", tmp_path)
-    monkeypatch.setattr(ph, "HISTORY_FILE", tmp_path / "price_history.db")
+    monkeypatch.setattr(ph, "HISTORY_FILE", ":memory:")
     yield
+    ph._reset_pool()
 
 
 def _make_result(
@@ -89,6 +90,26 @@ def test_record_results_multiple_fares():
     assert count == 2
 
 
+def test_record_results_batch_is_one_transaction():
+    results = [_make_result(flight_date=f"2025-06-{d:02d}") for d in range(1, 31)]
+    conn = ph._get_conn()
+    before = conn.total_changes
+    assert ph.record_results(results) == 30
+    assert conn.total_changes - before == 30
+    assert not conn.in_transaction
+    assert ph.get_stats("SFO", "NRT")["total_records"] == 30
+
+
+def test_record_results_empty():
+    assert ph.record_results([]) == 0
+
+
+def test_record_results_accepts_generator():
+    results = (_make_result(flight_date=f"2025-07-{d:02d}") for d in range(1, 4))
+    assert ph.record_results(results) == 3
+    assert ph.get_stats("SFO", "NRT")["unique_flight_dates"] == 3
+
+
 # ---------------------------------------------------------------------------
 # Tests: get_stats
 # ---------------------------------------------------------------------------
@@ -115,6 +136,18 @@ def test_get_stats_with_data():
     assert stats["unique_flight_dates"] == 3
 
 
+def test_get_stats_keys_and_formatting():
+    ph.record_results([_make_result(miles=55_555)])
+    stats = ph.get_stats("SFO", "NRT")
+    assert list(stats) == [
+        "total_records", "min_miles", "max_miles", "avg_miles",
+        "first_seen", "last_seen", "unique_flight_dates",
+    ]
+    assert stats["avg_miles"] == 55_555
+    assert len(stats["first_seen"]) == len("2025-06-01")
+    assert len(stats["last_seen"]) == len("2025-06-01 10:00")
+
+
 def test_get_stats_cabin_filter():
     result = _make_result(cabin="business", miles=65_000)
     ph.record_results([result])
@@ -172,7 +205,6 @@ def test_get_price_trend_lookback():
         ("SFO", "NRT", "2025-01-01", "business", "alaska", 80_000, 80.0, "AS1", old_time),
     )
     conn.commit()
-    conn.close()
 
     # Recent entry
     ph.record_results([_make_result(flight_date="2025-06-10", miles=60_000)])
@@ -246,6 +278,46 @@ def test_detect_new_lows_cabin_filter():
     assert alerts == []
 
 
+def test_detect_new_lows_many_routes_single_query():
+    routes = [("SFO", "NRT"), ("LAX", "LHR"), ("SEA", "ICN")]
+    ph.record_results([_make_result(origin=o, destination=d, miles=70_000) for o, d in routes])
+
+    statements = []
+    ph._get_conn().set_trace_callback(statements.append)
+    try:
+        alerts = ph.detect_new_lows(
+            [_make_result(origin=o, destination=d, miles=60_000) for o, d in routes]
+            + [_make_result(origin="SFO", destination="SYD", miles=10_000)]  # no history
+        )
+    finally:
+        ph._get_conn().set_trace_callback(None)
+
+    assert [a["route"] for a in alerts] == ["SFO→NRT", "LAX→LHR", "SEA→ICN"]
+    assert all(a["old_miles"] == 70_000 for a in alerts)
+    assert len(statements) == 1
+
+
+def test_detect_new_lows_batches_large_probes(monkeypatch):
+    monkeypatch.setattr(ph, "_PROBE_BATCH", 2)
+    dates = [f"2025-06-{d:02d}" for d in range(1, 6)]
+    ph.record_results([_make_result(flight_date=d, miles=70_000) for d in dates])
+
+    alerts = ph.detect_new_lows([_make_result(flight_date=d, miles=50_000) for d in dates])
+    assert [a["flight_date"] for a in alerts] == dates
+
+
+def test_route_lows_per_cabin_skips_routes_without_history():
+    ph.record_results([
+        _make_result(miles=70_000),
+        _make_result(miles=60_000, program="aeroplan"),
+        _make_result(cabin="economy", miles=30_000),
+        _make_result(origin="LAX", destination="LHR", miles=80_000),
+    ])
+    lows = ph.route_lows([("sfo", "nrt"), ("SEA", "ICN")])
+    assert lows == {("SFO", "NRT", "business"): 60_000, ("SFO", "NRT", "economy"): 30_000}
+    assert ph.route_lows([]) == {}
+
+
 # ---------------------------------------------------------------------------
 # Tests: clear_history
 # ---------------------------------------------------------------------------
@@ -263,3 +335,40 @@ def test_clear_history_all():
     ph.record_results([_make_result(origin="LAX", destination="LHR")])
     count = ph.clear_history()
     assert count == 2
+
+
+# ---------------------------------------------------------------------------
+# Connection pool
+# ---------------------------------------------------------------------------
+
+def test_connection_reused_across_calls():
+    conn = ph._get_conn()
+    ph.record_results([_make_result()])
+    ph.get_stats("SFO", "NRT")
+    assert ph._get_conn() is conn
+
+
+def test_connection_uses_wal(tmp_path, monkeypatch):
+    monkeypatch.setattr(ph, "HISTORY_FILE", tmp_path / "price_history.db")
+    mode = ph._get_conn().execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode == "wal"
+
+
+def test_pool_keyed_by_history_file(tmp_path, monkeypatch):
+    ph.record_results([_make_result()])
+    first = ph._get_conn()
+
+    other = tmp_path / "other"
+    monkeypatch.setattr(ph, "HISTORY_DIR", other)
+    monkeypatch.setattr(ph, "HISTORY_FILE", other / "price_history.db")
+    assert ph._get_conn() is not first
+    assert ph.get_stats("SFO", "NRT") == {"total_records": 0}
+
+
+def test_trend_cabin_lookup_uses_route_cabin_time_index():
+    plan = ph._get_conn().execute(
+        "EXPLAIN QUERY PLAN SELECT MIN(miles) FROM price_snapshots "
+        "WHERE origin = ? AND destination = ? AND recorded_at >= ? AND cabin = ?",
+        ("SFO", "NRT", 0, "business"),
+    ).fetchall()
+    assert "idx_route_cabin_time" in " ".join(row[-1] for row in plan)
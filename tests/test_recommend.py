@@ -21,11 +21,20 @@ def test_get_distance():
     assert get_distance("ABC", "XYZ") == 4000
 
 
+def test_get_distance_repeated_lookups_agree():
+    """Repeated lookups of a route give the same distance either way round."""
+    first = get_distance("SFO", "NRT")
+    assert get_distance("SFO", "NRT") == first
+    assert get_distance("NRT", "SFO") == first
+    assert get_distance("ABC", "XYZ") == get_distance("ABC", "XYZ") == 4000
+
+
 def test_cabin_multiplier():
     """Test cabin value multipliers."""
     assert calculate_cabin_multiplier("economy") == 1.0
     assert calculate_cabin_multiplier("business") == 2.5
     assert calculate_cabin_multiplier("first") == 3.0
+    assert calculate_cabin_multiplier("premium") == 1.0
 
 
 def test_calculate_score():
@@ -152,6 +161,19 @@ def test_rank_redemptions():
     assert len(recs_alaska) == 2
     assert all(r.fare.program == "alaska" for r in recs_alaska)
 
+    # Flights with nothing in the requested cabin are skipped
+    assert rank_redemptions(flights, cabin="premium") == []
+
+    # Ranking again gives the same order, distances and scores
+    again = rank_redemptions(flights)
+    assert [(r.destination, r.distance_miles, r.score) for r in again] == [
+        (r.destination, r.distance_miles, r.score) for r in recs
+    ]
+
+    # Inline scoring in rank_redemptions matches the public calculate_score
+    for rec in recs:
+        assert rec.score == pytest.approx(calculate_score(rec.fare, rec.distance_miles))
+
 
 def test_get_destinations_by_region():
     """Test destination filtering by region."""
@@ -180,6 +202,11 @@ def test_get_destinations_by_region():
     # Unknown region returns all
     unknown = get_destinations_by_region("mars")
     assert len(unknown) > 0
+    assert unknown == all_dests
+
+    # Callers get their own list
+    asia_dests.append("XXX")
+    assert "XXX" not in get_destinations_by_region("asia")
 
 
 def test_recommendation_format():
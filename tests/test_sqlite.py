@@ -0,0 +1,61 @@
+"""Tests for the shared per-thread SQLite connection pool."""
+
+import threading
+
+from wombat_miles._sqlite import ConnectionPool
+
+
+def _make_table(conn):
+    conn.execute("CREATE TABLE IF NOT EXISTS t (x INTEGER)")
+
+
+def test_connection_reused_and_configured(tmp_path):
+    pool = ConnectionPool(_make_table)
+    path = tmp_path / "nested" / "db.sqlite"
+    try:
+        conn = pool.get(path)
+        assert pool.get(path) is conn
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] == -20000
+        conn.execute("SELECT x FROM t")  # schema created on open
+    finally:
+        pool.reset()
+
+
+def test_extra_pragmas_run_before_schema(tmp_path):
+    pool = ConnectionPool(_make_table, pragmas=("PRAGMA auto_vacuum=INCREMENTAL",))
+    try:
+        conn = pool.get(tmp_path / "db.sqlite")
+        assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2  # INCREMENTAL
+    finally:
+        pool.reset()
+
+
+def test_pools_with_same_path_are_independent():
+    first = ConnectionPool(_make_table)
+    second = ConnectionPool(lambda conn: None)
+    try:
+        assert first.get(":memory:") is not second.get(":memory:")
+    finally:
+        first.reset()
+        second.reset()
+
+
+def test_connections_are_per_thread():
+    pool = ConnectionPool(_make_table)
+    main_conn = pool.get(":memory:")
+    seen = []
+
+    def worker():
+        seen.append(pool.get(":memory:"))
+        pool.reset()
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    try:
+        assert seen[0] is not main_conn
+        assert pool.get(":memory:") is main_conn
+    finally:
+        pool.reset()
@@ -22,22 +22,40 @@ Usage::
         fire_alert(t)
 """
 
+import atexit
 import json
 import logging
 import smtplib
 import sqlite3
+import threading
 import time
-import urllib.error
-import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterable, Optional
+
+import httpx
+
+try:
+    import orjson
+except ImportError:  # optional speedup, see pyproject [fast] extra
+    orjson = None
+
+from . import price_history
+from ._sqlite import ConnectionPool
+from .models import FlightFare
 
 logger = logging.getLogger(__name__)
 
+# orjson encodes straight to UTF-8 bytes, skipping the intermediate str.
+_dumps = orjson.dumps if orjson else (lambda obj: json.dumps(obj).encode("utf-8"))
+
 ALERTS_DIR = Path.home() / ".wombat-miles"
 ALERTS_DB = ALERTS_DIR / "alerts.db"
 
@@ -45,7 +63,7 @@ ALERTS_DB = ALERTS_DIR / "alerts.db"
 # Data model
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class Alert:
     """A configured award-flight alert."""
     id: int
@@ -86,7 +104,7 @@ class Alert:
         return ", ".join(parts) if parts else "none"
 
 
-@dataclass
+@dataclass(slots=True)
 class EmailConfig:
     """SMTP email configuration."""
     name: str
@@ -98,7 +116,7 @@ class EmailConfig:
     use_tls: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class TriggeredAlert:
     """Represents a fired alert with matching flight details."""
     alert: Alert
@@ -115,24 +133,69 @@ class TriggeredAlert:
     taxes_usd: float
     is_new_low: bool = False
     prev_low_miles: Optional[int] = None
+    # Derived once in __post_init__ for the notification formatters
+    drop_pct: Optional[float] = field(init=False, default=None)
+    dep_hhmm: str = field(init=False, default="")
+    arr_hhmm: str = field(init=False, default="")
 
-    @property
-    def drop_pct(self) -> Optional[float]:
+    def __post_init__(self) -> None:
         if self.is_new_low and self.prev_low_miles:
-            return round((self.prev_low_miles - self.miles) / self.prev_low_miles * 100, 1)
-        return None
+            self.drop_pct = round((self.prev_low_miles - self.miles) / self.prev_low_miles * 100, 1)
+        self.dep_hhmm = _hhmm(self.departure)
+        self.arr_hhmm = _hhmm(self.arrival)
+
+
+def _hhmm(timestamp: str) -> str:
+    """HH:MM part of a 'YYYY-MM-DD HH:MM:SS' timestamp, or the value unchanged."""
+    return timestamp[11:16] if len(timestamp) > 11 else timestamp
 
 
 # ---------------------------------------------------------------------------
 # Database helpers
 # ---------------------------------------------------------------------------
 
+
+# Statements used on hot paths, kept as constants so each has one exact text
+# and stays in the connection's prepared-statement cache.
+_SQL_ADD = """
+    INSERT INTO alerts (origin, destination, cabin, program, max_miles, email_config)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+_SQL_ADD_WEBHOOK = "INSERT INTO alert_webhooks (alert_id, url) VALUES (?, ?)"
+_SQL_ADD_EMAIL = "INSERT INTO alert_emails (alert_id, addr) VALUES (?, ?)"
+# Columns _rows_to_alerts reads; skips the legacy discord_webhook/webhooks/email_to
+_ALERT_COLS = "id, origin, destination, cabin, program, max_miles, email_config, enabled, created_at"
+_SQL_LIST_ALL = f"SELECT {_ALERT_COLS} FROM alerts ORDER BY id"
+_SQL_LIST_ENABLED = f"SELECT {_ALERT_COLS} FROM alerts WHERE enabled = 1 ORDER BY id"
+_SQL_GET = f"SELECT {_ALERT_COLS} FROM alerts WHERE id = ?"
+_SQL_ENABLE = "UPDATE alerts SET enabled = ? WHERE id = ?"
+_SQL_DEDUP = """
+    SELECT alert_id, flight_date, cabin, program, miles FROM alert_history
+    WHERE alert_id IN ({placeholders}) AND fired_at >= ?
+"""
+# Alert ids per _SQL_DEDUP query; plus fired_at this stays under SQLite's
+# historical 999-variable limit.
+_DEDUP_BATCH = 500
+_SQL_RECORD_FIRE = """
+    INSERT INTO alert_history
+        (alert_id, flight_no, flight_date, cabin, program, miles, taxes_usd, is_new_low, fired_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_SQL_PRUNE_HISTORY = "DELETE FROM alert_history WHERE fired_at < ?"
+
+
 def _get_conn() -> sqlite3.Connection:
-    """Return an open SQLite connection, creating the schema if needed."""
-    ALERTS_DIR.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(ALERTS_DB)
-    conn.row_factory = sqlite3.Row
-    
+    """Return this thread's SQLite connection for ALERTS_DB, opening it on first use."""
+    return _POOL.get(ALERTS_DB)
+
+
+def _reset_pool() -> None:
+    """Close this thread's pooled connections (tests call this when switching DB paths)."""
+    _POOL.reset()
+
+
+def _init_schema(conn: sqlite3.Connection) -> None:
+    """Create or migrate the alerts schema on a newly opened connection."""
     # Create or migrate alerts table
     conn.execute("""
         CREATE TABLE IF NOT EXISTS alerts (
@@ -143,8 +206,8 @@ def _get_conn() -> sqlite3.Connection:
             program          TEXT    NOT NULL DEFAULT 'all',
             max_miles        INTEGER,
             discord_webhook  TEXT,
-            webhooks         TEXT,              -- JSON array of webhook URLs
-            email_to         TEXT,              -- JSON array of email addresses
+            webhooks         TEXT,              -- legacy JSON array, moved to alert_webhooks
+            email_to         TEXT,              -- legacy JSON array, moved to alert_emails
             email_config     TEXT,              -- email config name
             enabled          INTEGER NOT NULL DEFAULT 1,
             created_at       TEXT    NOT NULL DEFAULT (datetime('now'))
@@ -167,6 +230,42 @@ def _get_conn() -> sqlite3.Connection:
         """)
         conn.commit()
     
+    # Notification targets, one row per webhook URL / email address
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS alert_webhooks (
+            alert_id  INTEGER NOT NULL,
+            url       TEXT    NOT NULL
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS alert_emails (
+            alert_id  INTEGER NOT NULL,
+            addr      TEXT    NOT NULL
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_webhooks_alert ON alert_webhooks(alert_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_emails_alert ON alert_emails(alert_id)")
+
+    # Move JSON-array webhooks/email_to columns into the child tables
+    # (idempotent: migrated columns are cleared)
+    with conn:
+        conn.execute("""
+            INSERT INTO alert_webhooks (alert_id, url)
+            SELECT alerts.id, j.value FROM alerts, json_each(alerts.webhooks) AS j
+            WHERE alerts.webhooks IS NOT NULL
+            ORDER BY alerts.id, j.key
+        """)
+        conn.execute("""
+            INSERT INTO alert_emails (alert_id, addr)
+            SELECT alerts.id, j.value FROM alerts, json_each(alerts.email_to) AS j
+            WHERE alerts.email_to IS NOT NULL
+            ORDER BY alerts.id, j.key
+        """)
+        conn.execute("""
+            UPDATE alerts SET webhooks = NULL, email_to = NULL
+            WHERE webhooks IS NOT NULL OR email_to IS NOT NULL
+        """)
+
     # Email configurations table
     conn.execute("""
         CREATE TABLE IF NOT EXISTS email_configs (
@@ -195,14 +294,83 @@ def _get_conn() -> sqlite3.Connection:
             fired_at     REAL    NOT NULL
         )
     """)
+
+    # Partial indexes over enabled alerts only: list_alerts() walks the id
+    # index in order, route lookups seek the route index; disabled rows add
+    # nothing to either
+    conn.execute("DROP INDEX IF EXISTS idx_alerts_route_enabled")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_alerts_active_route "
+        "ON alerts(origin, destination) WHERE enabled = 1"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_alerts_active_id ON alerts(id) WHERE enabled = 1"
+    )
+    # Covering index: the dedup query reads only these columns, so it is
+    # answered from the index without touching alert_history rows
+    conn.execute("DROP INDEX IF EXISTS idx_hist_alert_time")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_hist_dedup "
+        "ON alert_history(alert_id, fired_at, flight_date, cabin, program, miles)"
+    )
+    # get_alert_history without an alert_id walks this backwards for ORDER BY
+    # fired_at DESC LIMIT n instead of sorting the whole table
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_hist_fired ON alert_history(fired_at)")
     conn.commit()
-    return conn
+
+
+# auto_vacuum only takes effect on a freshly created DB; it lets
+# prune_history hand freed pages back to the filesystem without a full VACUUM.
+_POOL = ConnectionPool(_init_schema, pragmas=("PRAGMA auto_vacuum=INCREMENTAL",))
 
 
 # ---------------------------------------------------------------------------
 # CRUD
 # ---------------------------------------------------------------------------
 
+def _alert_row(
+    origin: str,
+    destination: str,
+    cabin: Optional[str] = None,
+    program: str = "all",
+    max_miles: Optional[int] = None,
+    webhooks: Optional[list[str]] = None,
+    email_to: Optional[list[str]] = None,
+    email_config: Optional[str] = None,
+) -> tuple[tuple, list[str], list[str]]:
+    """Split add_alert() arguments into (alerts row, webhooks, email_to)."""
+    return (
+        (origin.upper(), destination.upper(), cabin, program, max_miles, email_config),
+        webhooks or [],
+        email_to or [],
+    )
+
+
+def _insert_alerts(rows: list[tuple[tuple, list[str], list[str]]]) -> list[int]:
+    """Insert alerts and their notification targets in a single transaction.
+
+    Returns the new ids in order.
+    """
+    if not rows:
+        return []
+    conn = _get_conn()
+    with conn:
+        conn.executemany(_SQL_ADD, [alert_row for alert_row, _, _ in rows])
+        # executemany() leaves cursor.lastrowid unset; AUTOINCREMENT ids
+        # within one write transaction are consecutive, so derive the range.
+        last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+        alert_ids = list(range(last_id - len(rows) + 1, last_id + 1))
+        conn.executemany(
+            _SQL_ADD_WEBHOOK,
+            [(aid, url) for aid, (_, hooks, _) in zip(alert_ids, rows) for url in hooks],
+        )
+        conn.executemany(
+            _SQL_ADD_EMAIL,
+            [(aid, addr) for aid, (_, _, emails) in zip(alert_ids, rows) for addr in emails],
+        )
+    return alert_ids
+
+
 def add_alert(
     origin: str,
     destination: str,
@@ -214,71 +382,92 @@ def add_alert(
     email_config: Optional[str] = None,
 ) -> int:
     """Persist a new alert. Returns the new alert id."""
-    conn = _get_conn()
-    webhooks_json = json.dumps(webhooks) if webhooks else None
-    email_to_json = json.dumps(email_to) if email_to else None
-    
-    cur = conn.execute(
-        """
-        INSERT INTO alerts (origin, destination, cabin, program, max_miles, webhooks, email_to, email_config)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        (origin.upper(), destination.upper(), cabin, program, max_miles, webhooks_json, email_to_json, email_config),
-    )
-    conn.commit()
-    alert_id = cur.lastrowid
-    conn.close()
+    (alert_id,) = _insert_alerts([
+        _alert_row(origin, destination, cabin, program, max_miles, webhooks, email_to, email_config)
+    ])
     logger.info("Alert #%d created: %s→%s", alert_id, origin, destination)
     return alert_id
 
 
-def _row_to_alert(row: sqlite3.Row) -> Alert:
-    """Convert a DB row to an Alert object, parsing JSON fields."""
-    d = dict(row)
-    # Parse JSON fields
-    d["webhooks"] = json.loads(d.get("webhooks") or "[]")
-    d["email_to"] = json.loads(d.get("email_to") or "[]")
-    # Remove old discord_webhook field if present
-    d.pop("discord_webhook", None)
-    return Alert(**d)
+def add_alerts_bulk(specs: Iterable[dict]) -> list[int]:
+    """Persist several alerts in one transaction.
+
+    Each spec is a dict of add_alert() keyword arguments. Returns the new
+    alert ids in the same order as the specs.
+    """
+    alert_ids = _insert_alerts([_alert_row(**spec) for spec in specs])
+    logger.info("%d alerts created", len(alert_ids))
+    return alert_ids
+
+
+def _fetch_targets(table: str, column: str, alert_ids: list[int]) -> dict[int, list[str]]:
+    """Fetch one child table's values for many alerts, grouped by alert id."""
+    placeholders = ",".join("?" * len(alert_ids))
+    rows = _get_conn().execute(
+        f"SELECT alert_id, {column} FROM {table} "
+        f"WHERE alert_id IN ({placeholders}) ORDER BY alert_id, rowid",
+        alert_ids,
+    ).fetchall()
+    return {
+        alert_id: [r[1] for r in group]
+        for alert_id, group in groupby(rows, key=itemgetter(0))
+    }
+
+
+def _rows_to_alerts(rows: list[sqlite3.Row]) -> list[Alert]:
+    """Convert DB rows to Alert objects, attaching webhooks and emails."""
+    if not rows:
+        return []
+    alert_ids = [r["id"] for r in rows]
+    webhooks = _fetch_targets("alert_webhooks", "url", alert_ids)
+    emails = _fetch_targets("alert_emails", "addr", alert_ids)
+    return [
+        Alert(
+            id=row["id"],
+            origin=row["origin"],
+            destination=row["destination"],
+            cabin=row["cabin"],
+            program=row["program"],
+            max_miles=row["max_miles"],
+            webhooks=webhooks.get(row["id"], []),
+            email_to=emails.get(row["id"], []),
+            email_config=row["email_config"],
+            enabled=row["enabled"],
+            created_at=row["created_at"],
+        )
+        for row in rows
+    ]
 
 
 def list_alerts(include_disabled: bool = False) -> list[Alert]:
     """Return configured alerts."""
     conn = _get_conn()
-    where = "" if include_disabled else "WHERE enabled = 1"
-    rows = conn.execute(
-        f"SELECT * FROM alerts {where} ORDER BY id"
-    ).fetchall()
-    conn.close()
-    return [_row_to_alert(r) for r in rows]
+    rows = conn.execute(_SQL_LIST_ALL if include_disabled else _SQL_LIST_ENABLED).fetchall()
+    return _rows_to_alerts(rows)
 
 
 def get_alert(alert_id: int) -> Optional[Alert]:
     """Fetch a single alert by id."""
     conn = _get_conn()
-    row = conn.execute("SELECT * FROM alerts WHERE id = ?", (alert_id,)).fetchone()
-    conn.close()
-    return _row_to_alert(row) if row else None
+    row = conn.execute(_SQL_GET, (alert_id,)).fetchone()
+    return _rows_to_alerts([row])[0] if row else None
 
 
 def remove_alert(alert_id: int) -> bool:
     """Hard-delete an alert. Returns True if a row was deleted."""
     conn = _get_conn()
-    cur = conn.execute("DELETE FROM alerts WHERE id = ?", (alert_id,))
-    conn.commit()
-    conn.close()
+    with conn:
+        cur = conn.execute("DELETE FROM alerts WHERE id = ?", (alert_id,))
+        conn.execute("DELETE FROM alert_webhooks WHERE alert_id = ?", (alert_id,))
+        conn.execute("DELETE FROM alert_emails WHERE alert_id = ?", (alert_id,))
     return cur.rowcount > 0
 
 
 def enable_alert(alert_id: int, enabled: bool = True) -> bool:
     """Enable or disable an alert without deleting it."""
     conn = _get_conn()
-    cur = conn.execute(
-        "UPDATE alerts SET enabled = ? WHERE id = ?", (1 if enabled else 0, alert_id)
-    )
+    cur = conn.execute(_SQL_ENABLE, (1 if enabled else 0, alert_id))
     conn.commit()
-    conn.close()
     return cur.rowcount > 0
 
 
@@ -305,7 +494,8 @@ def add_email_config(
         (name, smtp_host, smtp_port, smtp_user, smtp_pass, from_addr, 1 if use_tls else 0),
     )
     conn.commit()
-    conn.close()
+    with _smtp_lock(name):
+        _drop_smtp_session(name)  # credentials may have changed
     logger.info("Email config '%s' saved", name)
 
 
@@ -313,7 +503,6 @@ def list_email_configs() -> list[EmailConfig]:
     """Return all email configurations (passwords redacted)."""
     conn = _get_conn()
     rows = conn.execute("SELECT * FROM email_configs ORDER BY name").fetchall()
-    conn.close()
     return [
         EmailConfig(
             name=r["name"],
@@ -332,7 +521,6 @@ def get_email_config(name: str) -> Optional[EmailConfig]:
     """Fetch an email config by name (with full password)."""
     conn = _get_conn()
     row = conn.execute("SELECT * FROM email_configs WHERE name = ?", (name,)).fetchone()
-    conn.close()
     if not row:
         return None
     return EmailConfig(
@@ -351,7 +539,8 @@ def remove_email_config(name: str) -> bool:
     conn = _get_conn()
     cur = conn.execute("DELETE FROM email_configs WHERE name = ?", (name,))
     conn.commit()
-    conn.close()
+    with _smtp_lock(name):
+        _drop_smtp_session(name)
     return cur.rowcount > 0
 
 
@@ -359,16 +548,54 @@ def remove_email_config(name: str) -> bool:
 # Alert matching
 # ---------------------------------------------------------------------------
 
+def _recently_fired(alert_ids: set[int], since: float) -> set[tuple]:
+    """Return (alert_id, flight_date, cabin, program, miles) keys fired since `since`."""
+    conn = _get_conn()
+    ids = list(alert_ids)
+    fired: set[tuple] = set()
+    for start in range(0, len(ids), _DEDUP_BATCH):
+        batch = ids[start:start + _DEDUP_BATCH]
+        rows = conn.execute(
+            _SQL_DEDUP.format(placeholders=",".join("?" * len(batch))),
+            (*batch, since),
+        )
+        fired.update(tuple(r) for r in rows)
+    return fired
+
+
+def _route_lows(routes: set[tuple[str, str]]) -> dict[tuple[str, str, str], int]:
+    """Lowest recorded miles per (origin, destination, cabin) on the given
+    routes; empty if price history is unavailable."""
+    try:
+        return price_history.route_lows(routes)
+    except Exception:
+        return {}
+
+
+def _fare_predicate(alert: Alert) -> Callable[[FlightFare], bool]:
+    """Build the program/max_miles check for one alert with its settings folded in."""
+    program, max_miles = alert.program, alert.max_miles
+    if program == "all":
+        if max_miles is None:
+            return lambda fare: True
+        return lambda fare: fare.miles <= max_miles
+    if max_miles is None:
+        return lambda fare: fare.program == program
+    return lambda fare: fare.program == program and fare.miles <= max_miles
+
+
 def check_alerts(
-    search_results: list,
+    search_results: Iterable,
     alerts: Optional[list[Alert]] = None,
     dedup_hours: float = 24.0,
 ) -> list[TriggeredAlert]:
     """Match search results against configured alerts.
 
     Args:
-        search_results: list of SearchResult objects from a scraper run.
+        search_results: iterable of SearchResult objects from a scraper run
+            (consumed once, so a generator works).
         alerts: optional list of Alert objects (loaded from DB if None).
+            Disabled alerts are skipped.
         dedup_hours: suppress re-firing the same alert+flight within N hours.
 
     Returns:
@@ -379,61 +606,61 @@ def check_alerts(
     if not alerts:
         return []
 
-    conn = _get_conn()
+    # Index enabled alerts by route so each result only visits its own
+    # alerts. Each entry snapshots the fields the flight loop reads (id,
+    # cabin) next to the specialized fare predicate, so the hot loop works
+    # on locals instead of re-reading Alert attributes per flight.
+    by_route: dict[
+        tuple[str, str], list[tuple[Alert, int, Optional[str], Callable]]
+    ] = defaultdict(list)
+    for alert in alerts:
+        if alert.enabled:
+            by_route[(alert.origin, alert.destination)].append(
+                (alert, alert.id, alert.cabin, _fare_predicate(alert))
+            )
+
+    # Single pass over the input, keeping only results some alert watches
+    matched = [
+        (result, route_alerts)
+        for result in search_results
+        if (route_alerts := by_route.get((result.origin, result.destination)))
+    ]
+    if not matched:
+        return []
+    candidate_ids = {spec[1] for _, route_alerts in matched for spec in route_alerts}
+
     triggered: list[TriggeredAlert] = []
     since_dedup = time.time() - dedup_hours * 3600
+    recently_fired = _recently_fired(candidate_ids, since_dedup)
+    # Historical low per (origin, destination, cabin) for every matched route
+    # in one query; cabins without history are simply absent.
+    route_lows = _route_lows({(result.origin, result.destination) for result, _ in matched})
 
-    for result in search_results:
-        for alert in alerts:
-            # Route filter
-            if alert.origin != result.origin or alert.destination != result.destination:
-                continue
-
+    for result, route_alerts in matched:
+        for alert, alert_id, cabin, fare_ok in route_alerts:
             for flight in result.flights:
-                # Program filter
-                best_fare = flight.best_fare(alert.cabin)
-                if best_fare is None:
-                    continue
-                if alert.program != "all" and best_fare.program != alert.program:
-                    continue
-
-                # Miles threshold filter
-                if alert.max_miles is not None and best_fare.miles > alert.max_miles:
+                # Cabin filter, then program + miles threshold
+                best_fare = flight.best_fare(cabin)
+                if best_fare is None or not fare_ok(best_fare):
                     continue
 
                 # Dedup: skip if we already fired this exact combo recently
-                already_fired = conn.execute(
-                    """
-                    SELECT 1 FROM alert_history
-                    WHERE alert_id = ? AND flight_date = ? AND cabin = ?
-                          AND program = ? AND miles = ? AND fired_at >= ?
-                    LIMIT 1
-                    """,
-                    (
-                        alert.id,
-                        result.date,
-                        best_fare.cabin,
-                        best_fare.program,
-                        best_fare.miles,
-                        since_dedup,
-                    ),
-                ).fetchone()
-                if already_fired:
+                if (
+                    alert_id,
+                    result.date,
+                    best_fare.cabin,
+                    best_fare.program,
+                    best_fare.miles,
+                ) in recently_fired:
                     continue
 
                 # Check if it's a new historical low
                 is_new_low = False
                 prev_low = None
-                try:
-                    from . import price_history
-                    stats = price_history.get_stats(
-                        result.origin, result.destination, best_fare.cabin
-                    )
-                    if stats.get("min_miles") and best_fare.miles < stats["min_miles"]:
-                        is_new_low = True
-                        prev_low = stats["min_miles"]
-                except Exception:
-                    pass
+                hist_low = route_lows.get((result.origin, result.destination, best_fare.cabin))
+                if hist_low and best_fare.miles < hist_low:
+                    is_new_low = True
+                    prev_low = hist_low
 
                 triggered.append(
                     TriggeredAlert(
@@ -454,7 +681,6 @@ def check_alerts(
                     )
                 )
 
-    conn.close()
     return triggered
 
 
@@ -462,23 +688,34 @@ def check_alerts(
 # Notification dispatch
 # ---------------------------------------------------------------------------
 
-def build_discord_embed(t: TriggeredAlert) -> dict:
-    """Build a Discord embed dict for a triggered alert."""
-    cabin_emoji = {"economy": "🪑", "business": "🛋️", "first": "👑"}.get(t.cabin, "✈️")
-    program_emoji = {"alaska": "🌲", "aeroplan": "🍁"}.get(t.program, "✈️")
+_CABIN_EMOJI = {"economy": "🪑", "business": "🛋️", "first": "👑"}
+_PROGRAM_EMOJI = {"alaska": "🌲", "aeroplan": "🍁"}
+_NEW_LOW_BADGE = " 🔥 NEW LOW!"
+
+# Embed color: new low = red (danger/attention), normal = green
+_EMBED_COLOR_NEW_LOW = 0xFF4444
+_EMBED_COLOR_NORMAL = 0x00CC44
+
+
+def build_discord_embed(t: TriggeredAlert, timestamp: Optional[str] = None) -> dict:
+    """Build a Discord embed dict for a triggered alert.
+
+    *timestamp* is an ISO-8601 UTC string; batch senders pass one shared
+    value instead of formatting the current time per embed.
+    """
+    cabin_emoji = _CABIN_EMOJI.get(t.cabin, "✈️")
+    program_emoji = _PROGRAM_EMOJI.get(t.program, "✈️")
 
-    title_parts = [f"🦘 Award Alert: {t.origin} → {t.destination}"]
+    title = f"🦘 Award Alert: {t.origin} → {t.destination}"
     if t.is_new_low:
-        title_parts.append(" 🔥 NEW LOW!")
-    title = "".join(title_parts)
+        title += _NEW_LOW_BADGE
 
-    # Color: new low = red (danger/attention), normal = green
-    color = 0xFF4444 if t.is_new_low else 0x00CC44
+    color = _EMBED_COLOR_NEW_LOW if t.is_new_low else _EMBED_COLOR_NORMAL
 
     description_lines = [
         f"{cabin_emoji} **{t.cabin.title()}** · {program_emoji} {t.program.title()}",
         f"🗓️ **{t.flight_date}** · ✈ {t.flight_no}",
-        f"⏰ {t.departure[11:16] if len(t.departure) > 11 else t.departure} → {t.arrival[11:16] if len(t.arrival) > 11 else t.arrival}",
+        f"⏰ {t.dep_hhmm} → {t.arr_hhmm}",
         f"💰 **{t.miles:,} miles** + ${t.taxes_usd:.0f} taxes",
     ]
     if t.is_new_low and t.prev_low_miles:
@@ -495,26 +732,119 @@ def build_discord_embed(t: TriggeredAlert) -> dict:
         "description": "\n".join(description_lines),
         "color": color,
         "footer": {"text": footer_text},
-        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "timestamp": timestamp or datetime.utcnow().isoformat() + "Z",
     }
 
 
-def _send_webhook(webhook_url: str, t: TriggeredAlert) -> bool:
-    """Send a single webhook notification."""
-    embed = build_discord_embed(t)
-    payload = json.dumps({"embeds": [embed]}).encode("utf-8")
-    req = urllib.request.Request(
-        webhook_url,
-        data=payload,
-        headers={"Content-Type": "application/json"},
-        method="POST",
-    )
+# Upper bound on concurrent webhook/email sends per fire_alerts batch
+_MAX_NOTIFY_WORKERS = 8
+
+# Shared keep-alive client so repeated webhooks to Discord/Slack reuse the
+# TLS connection; created on first use.
+_HTTP: Optional[httpx.Client] = None
+_HTTP_LOCK = threading.Lock()
+
+
+def _http_client() -> httpx.Client:
+    global _HTTP
+    if _HTTP is None:
+        with _HTTP_LOCK:
+            if _HTTP is None:
+                _HTTP = httpx.Client(
+                    timeout=10,
+                    limits=httpx.Limits(max_connections=_MAX_NOTIFY_WORKERS),
+                    # Retry failed connects; a POST that reached the server is
+                    # never resent, so a webhook can't be delivered twice
+                    transport=httpx.HTTPTransport(retries=2),
+                )
+    return _HTTP
+
+
+def _webhook_payload(t: TriggeredAlert, timestamp: Optional[str] = None) -> bytes:
+    return _dumps({"embeds": [build_discord_embed(t, timestamp)]})
+
+
+def _send_webhook(webhook_url: str, t: TriggeredAlert, payload: Optional[bytes] = None) -> bool:
+    """Send a single webhook notification.
+
+    *payload* is the pre-encoded embed body, so an alert with several
+    webhooks builds and serializes its embed once.
+    """
+    if payload is None:
+        payload = _webhook_payload(t)
     try:
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            return resp.status in (200, 204)
-    except (urllib.error.URLError, urllib.error.HTTPError) as e:
+        resp = _http_client().post(
+            webhook_url,
+            content=payload,
+            headers={"Content-Type": "application/json"},
+        )
+    except httpx.HTTPError as e:
         logger.warning("Webhook failed (%s): %s", webhook_url[:50], e)
         return False
+    if resp.status_code not in (200, 204):
+        logger.warning("Webhook failed (%s): HTTP %d", webhook_url[:50], resp.status_code)
+        return False
+    return True
+
+
+# Logged-in SMTP sessions per email config name, reused across sends so the
+# connect + STARTTLS + login handshake is paid once per process. SMTP is a
+# sequential protocol, so each session is used under its config's lock.
+_SMTP_SESSIONS: dict[str, smtplib.SMTP] = {}
+_SMTP_LOCKS: dict[str, threading.Lock] = {}
+
+
+def _smtp_lock(name: str) -> threading.Lock:
+    """The lock guarding a config's pooled session (sends, reconnects, drops)."""
+    return _SMTP_LOCKS.setdefault(name, threading.Lock())
+
+
+def _smtp_session(email_config: EmailConfig) -> smtplib.SMTP:
+    """Return a live SMTP session for the config, reconnecting if needed.
+
+    Must be called with the config's _smtp_lock held.
+    """
+    server = _SMTP_SESSIONS.get(email_config.name)
+    if server is not None:
+        try:
+            if server.noop()[0] == 250:
+                return server
+        except (smtplib.SMTPException, OSError):
+            pass
+        _drop_smtp_session(email_config.name)
+
+    server = smtplib.SMTP(email_config.smtp_host, email_config.smtp_port, timeout=10)
+    if email_config.use_tls:
+        server.starttls()
+    server.login(email_config.smtp_user, email_config.smtp_pass)
+    _SMTP_SESSIONS[email_config.name] = server
+    return server
+
+
+def _drop_smtp_session(name: str, server: Optional[smtplib.SMTP] = None) -> None:
+    """Close and forget the pooled SMTP session for a config, if any.
+
+    With *server*, only that session is dropped, so a failed send never
+    discards a session another send has since reconnected. Callers hold
+    the config's _smtp_lock.
+    """
+    if server is not None and _SMTP_SESSIONS.get(name) is not server:
+        return
+    server = _SMTP_SESSIONS.pop(name, None)
+    if server is not None:
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+
+
+def _close_smtp_sessions() -> None:
+    for name in list(_SMTP_SESSIONS):
+        with _smtp_lock(name):
+            _drop_smtp_session(name)
+
+
+atexit.register(_close_smtp_sessions)
 
 
 def _send_email(email_config: EmailConfig, to_addr: str, t: TriggeredAlert) -> bool:
@@ -522,10 +852,10 @@ def _send_email(email_config: EmailConfig, to_addr: str, t: TriggeredAlert) -> b
     # Build email content
     subject = f"🦘 Award Alert: {t.origin} → {t.destination}"
     if t.is_new_low:
-        subject += " 🔥 NEW LOW!"
+        subject += _NEW_LOW_BADGE
 
-    cabin_emoji = {"economy": "🪑", "business": "🛋️", "first": "👑"}.get(t.cabin, "✈️")
-    program_emoji = {"alaska": "🌲", "aeroplan": "🍁"}.get(t.program, "✈️")
+    cabin_emoji = _CABIN_EMOJI.get(t.cabin, "✈️")
+    program_emoji = _PROGRAM_EMOJI.get(t.program, "✈️")
     
     body_lines = [
         f"{cabin_emoji} {t.cabin.title()} · {program_emoji} {t.program.title()}",
@@ -547,21 +877,17 @@ def _send_email(email_config: EmailConfig, to_addr: str, t: TriggeredAlert) -> b
     msg["Subject"] = subject
     msg.attach(MIMEText(body, "plain"))
 
-    # Send via SMTP
-    try:
-        if email_config.use_tls:
-            server = smtplib.SMTP(email_config.smtp_host, email_config.smtp_port, timeout=10)
-            server.starttls()
-        else:
-            server = smtplib.SMTP(email_config.smtp_host, email_config.smtp_port, timeout=10)
-        
-        server.login(email_config.smtp_user, email_config.smtp_pass)
-        server.send_message(msg)
-        server.quit()
-        return True
-    except Exception as e:
-        logger.warning("Email failed (to %s): %s", to_addr, e)
-        return False
+    # Send via the pooled SMTP session for this config
+    with _smtp_lock(email_config.name):
+        server = None
+        try:
+            server = _smtp_session(email_config)
+            server.send_message(msg)
+            return True
+        except Exception as e:
+            _drop_smtp_session(email_config.name, server)
+            logger.warning("Email failed (to %s): %s", to_addr, e)
+            return False
 
 
 def fire_alert(t: TriggeredAlert, dry_run: bool = False) -> bool:
@@ -572,55 +898,100 @@ def fire_alert(t: TriggeredAlert, dry_run: bool = False) -> bool:
     Returns:
         True if at least one notification was sent (or dry_run=True), False if all failed.
     """
-    success_count = 0
-    total_attempts = 0
-
-    # Send webhooks
-    if t.alert.webhooks and not dry_run:
-        for webhook_url in t.alert.webhooks:
-            total_attempts += 1
-            if _send_webhook(webhook_url, t):
-                success_count += 1
-    
-    # Send emails
-    if t.alert.email_to and t.alert.email_config and not dry_run:
-        email_config = get_email_config(t.alert.email_config)
-        if email_config:
-            for to_addr in t.alert.email_to:
-                total_attempts += 1
-                if _send_email(email_config, to_addr, t):
-                    success_count += 1
-        else:
-            logger.warning("Email config '%s' not found, skipping email notifications", t.alert.email_config)
-    
+    return fire_alerts([t], dry_run=dry_run)[0]
+
+
+def _run_notify_job(job: tuple[int, Callable[..., bool], tuple]) -> bool:
+    """Run one send, treating any exception as a failed notification.
+
+    Keeps one bad target (e.g. a malformed stored webhook URL) from aborting
+    the batch before its alert_history rows are written.
+    """
+    _, send, args = job
+    try:
+        return send(*args)
+    except Exception:
+        logger.exception("Notification failed")
+        return False
+
+
+def fire_alerts(triggered: list[TriggeredAlert], dry_run: bool = False) -> list[bool]:
+    """Fire a batch of triggered alerts, sending all their notifications concurrently.
+
+    Every webhook and email across the batch shares one worker pool (and the
+    keep-alive HTTP client), so K notifications cost about ceil(K / workers)
+    round-trips instead of K. Each alert is recorded in alert_history.
+
+    Returns:
+        One result per triggered alert, with fire_alert's semantics.
+    """
+    timestamp = datetime.utcnow().isoformat() + "Z"
+    email_configs: dict[str, Optional[EmailConfig]] = {}
+
+    # (index into triggered, send function, args) for every notification
+    jobs: list[tuple[int, Callable[..., bool], tuple]] = []
+    if not dry_run:
+        for i, t in enumerate(triggered):
+            if t.alert.webhooks:
+                payload = _webhook_payload(t, timestamp)
+                for webhook_url in t.alert.webhooks:
+                    jobs.append((i, _send_webhook, (webhook_url, t, payload)))
+
+            if t.alert.email_to and t.alert.email_config:
+                name = t.alert.email_config
+                if name not in email_configs:
+                    email_configs[name] = get_email_config(name)
+                email_config = email_configs[name]
+                if email_config:
+                    for to_addr in t.alert.email_to:
+                        jobs.append((i, _send_email, (email_config, to_addr, t)))
+                else:
+                    logger.warning("Email config '%s' not found, skipping email notifications", name)
+
+    if len(jobs) > 1:
+        with ThreadPoolExecutor(max_workers=min(len(jobs), _MAX_NOTIFY_WORKERS)) as pool:
+            sent = list(pool.map(_run_notify_job, jobs))
+    else:
+        sent = [_run_notify_job(job) for job in jobs]
+
+    attempts = [0] * len(triggered)
+    successes = [0] * len(triggered)
+    for (i, _, _), ok in zip(jobs, sent):
+        attempts[i] += 1
+        successes[i] += 1 if ok else 0
+
     if dry_run:
-        logger.info("[dry-run] Would notify: %s %s %d miles", t.origin, t.flight_date, t.miles)
-        success_count = 1  # treat dry-run as success
+        for t in triggered:
+            logger.info("[dry-run] Would notify: %s %s %d miles", t.origin, t.flight_date, t.miles)
 
-    # Log to alert_history regardless of success (audit trail)
+    # Log to alert_history regardless of success (audit trail), one
+    # executemany in a single transaction for the whole batch
+    fired_at = time.time()
     conn = _get_conn()
-    conn.execute(
-        """
-        INSERT INTO alert_history
-            (alert_id, flight_no, flight_date, cabin, program, miles, taxes_usd, is_new_low, fired_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        (
-            t.alert.id,
-            t.flight_no,
-            t.flight_date,
-            t.cabin,
-            t.program,
-            t.miles,
-            t.taxes_usd,
-            1 if t.is_new_low else 0,
-            time.time(),
-        ),
-    )
-    conn.commit()
-    conn.close()
-    
-    return success_count > 0 or total_attempts == 0
+    with conn:
+        conn.executemany(
+            _SQL_RECORD_FIRE,
+            [
+                (
+                    t.alert.id,
+                    t.flight_no,
+                    t.flight_date,
+                    t.cabin,
+                    t.program,
+                    t.miles,
+                    t.taxes_usd,
+                    1 if t.is_new_low else 0,
+                    fired_at,
+                )
+                for t in triggered
+            ],
+        )
+
+    # dry_run counts as success; so does an alert with nothing to send
+    return [
+        dry_run or successes[i] > 0 or attempts[i] == 0
+        for i in range(len(triggered))
+    ]
 
 
 def get_alert_history(alert_id: Optional[int] = None, limit: int = 50) -> list[dict]:
@@ -635,5 +1006,22 @@ def get_alert_history(alert_id: Optional[int] = None, limit: int = 50) -> list[d
         rows = conn.execute(
             "SELECT * FROM alert_history ORDER BY fired_at DESC LIMIT ?", (limit,)
         ).fetchall()
-    conn.close()
     return [dict(r) for r in rows]
+
+
+def prune_history(days: float = 90) -> int:
+    """Delete alert_history rows fired more than `days` days ago.
+
+    Keeps the dedup probe's working set small; freed pages are returned to
+    the filesystem when the DB was created with incremental auto-vacuum.
+
+    Returns:
+        Number of rows deleted.
+    """
+    conn = _get_conn()
+    with conn:
+        cur = conn.execute(_SQL_PRUNE_HISTORY, (time.time() - days * 86400,))
+    # incremental_vacuum frees one page per step; executescript runs it to
+    # completion (a plain execute() would only step it once)
+    conn.executescript("PRAGMA incremental_vacuum;")
+    return cur.rowcount
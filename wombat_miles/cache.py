@@ -1,5 +1,7 @@
 """SQLite cache for award search results (4-hour TTL)."""
 
+import atexit
+import hashlib
 import json
 import logging
 import sqlite3
@@ -7,6 +9,8 @@ import time
 from pathlib import Path
 from typing import Any, Optional
 
+from ._sqlite import ConnectionPool
+
 logger = logging.getLogger(__name__)
 
 CACHE_DIR = Path.home() / ".wombat-miles"
@@ -15,32 +19,61 @@ DEFAULT_TTL = 4 * 60 * 60  # 4 hours in seconds
 
 
 def _get_conn() -> sqlite3.Connection:
-    CACHE_DIR.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(CACHE_FILE)
+    """Return this thread's SQLite connection for CACHE_FILE, opening it on first use."""
+    return _POOL.get(CACHE_FILE)
+
+
+def _reset_pool() -> None:
+    """Close this thread's pooled connections and drop the in-process mirror."""
+    _POOL.reset()
+    _MEM.clear()
+
+
+atexit.register(_reset_pool)
+
+
+# In-process mirror of the cache table: key digest -> (expires_at, JSON value).
+# Loaded once per cache file; set() writes through to SQLite, so get() is a
+# dict lookup plus a TTL compare.
+_MEM: dict[Path, dict[bytes, tuple[float, str]]] = {}
+
+
+def _mem() -> dict[bytes, tuple[float, str]]:
+    mem = _MEM.get(CACHE_FILE)
+    if mem is None:
+        # Rows written before keys were hashed have TEXT keys; skip them
+        rows = _get_conn().execute(
+            "SELECT key, expires_at, value FROM cache "
+            "WHERE expires_at >= ? AND typeof(key) = 'blob'",
+            (time.time(),),
+        ).fetchall()
+        mem = _MEM[CACHE_FILE] = {key: (expires_at, value) for key, expires_at, value in rows}
+    return mem
+
+
+def _init_schema(conn: sqlite3.Connection) -> None:
     conn.execute("""
         CREATE TABLE IF NOT EXISTS cache (
-            key TEXT PRIMARY KEY,
+            key BLOB PRIMARY KEY,           -- _key_digest() of the cache key
             value TEXT NOT NULL,
             expires_at REAL NOT NULL
         )
     """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_exp ON cache(expires_at)")
     conn.commit()
-    return conn
+
+
+_POOL = ConnectionPool(_init_schema)
 
 
 def get(key: str) -> Optional[Any]:
     """Get a cached value, returning None if missing or expired."""
     try:
-        conn = _get_conn()
-        row = conn.execute(
-            "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
-        ).fetchone()
-        conn.close()
-
-        if row is None:
+        entry = _mem().get(_key_digest(key))
+        if entry is None:
             return None
 
-        value_str, expires_at = row
+        expires_at, value_str = entry
         if time.time() > expires_at:
             return None
 
@@ -53,13 +86,16 @@ def get(key: str) -> Optional[Any]:
 def set(key: str, value: Any, ttl: int = DEFAULT_TTL) -> None:
     """Store a value in cache with TTL."""
     try:
+        digest = _key_digest(key)
+        value_str = json.dumps(value)
+        expires_at = time.time() + ttl
         conn = _get_conn()
         conn.execute(
             "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
-            (key, json.dumps(value), time.time() + ttl),
+            (digest, value_str, expires_at),
         )
         conn.commit()
-        conn.close()
+        _mem()[digest] = (expires_at, value_str)
     except Exception as e:
         logger.warning(f"Cache set error: {e}")
 
@@ -67,13 +103,13 @@ def set(key: str, value: Any, ttl: int = DEFAULT_TTL) -> None:
 def clear_expired() -> int:
     """Remove expired cache entries. Returns number of removed entries."""
     try:
+        now = time.time()
         conn = _get_conn()
-        cursor = conn.execute(
-            "DELETE FROM cache WHERE expires_at < ?", (time.time(),)
-        )
-        count = cursor.rowcount
-        conn.commit()
-        conn.close()
+        with conn:
+            count = conn.execute("DELETE FROM cache WHERE expires_at < ?", (now,)).rowcount
+        mem = _mem()
+        for key in [k for k, (expires_at, _) in mem.items() if expires_at < now]:
+            del mem[key]
         return count
     except Exception as e:
         logger.warning(f"Cache clear error: {e}")
@@ -86,10 +122,15 @@ def clear_all() -> None:
         conn = _get_conn()
         conn.execute("DELETE FROM cache")
         conn.commit()
-        conn.close()
+        _mem().clear()
     except Exception as e:
         logger.warning(f"Cache clear_all error: {e}")
 
 
 def make_key(program: str, origin: str, destination: str, date: str) -> str:
     return f"{program}_{origin.upper()}_{destination.upper()}_{date}"
+
+
+def _key_digest(key: str) -> bytes:
+    """Fixed 16-byte key stored in SQLite, keeping the primary-key index small."""
+    return hashlib.blake2b(key.encode(), digest_size=16).digest()
@@ -815,6 +815,21 @@ def alert_history(
     console.print(table)
 
 
+@alert_app.command("prune")
+def alert_prune(
+    days: Annotated[int, typer.Option("--days", "-d", help="Keep history newer than this many days")] = 90,
+):
+    """
+    🧹 Delete old alert fire history.
+
+    Example:
+
+      wombat-miles alert prune --days 30
+    """
+    count = alerts_mod.prune_history(days)
+    console.print(f"[green]Pruned {count} alert history rows older than {days} days.[/green]")
+
+
 # ---------------------------------------------------------------------------
 # monitor command — run all alerts, optionally fire webhooks
 # ---------------------------------------------------------------------------
@@ -905,7 +920,12 @@ def monitor(
         triggered = alerts_mod.check_alerts(results, alerts=route_alerts, dedup_hours=dedup_hours)
         total_triggered += len(triggered)
 
-        for t in triggered:
+        # Fire as soon as the route is checked so notifications don't wait on
+        # the remaining scrapes; the route's sends run concurrently and its
+        # alert_history rows are written in one transaction
+        fired = alerts_mod.fire_alerts(triggered, dry_run=dry_run)
+
+        for t, sent in zip(triggered, fired):
             new_low_badge = " [bold red]🔥 NEW LOW[/bold red]" if t.is_new_low else ""
             console.print(
                 f"    🔔 Alert #{t.alert.id}: "
@@ -915,8 +935,7 @@ def monitor(
                 f"{new_low_badge}"
             )
 
-            sent = alerts_mod.fire_alert(t, dry_run=dry_run)
-            if sent and t.alert.discord_webhook and not dry_run:
+            if sent and t.alert.webhooks and not dry_run:
                 console.print(f"      ✅ Discord notification sent")
                 total_sent += 1
             elif dry_run:
@@ -1268,9 +1287,9 @@ def connection(
 def email_config_add(
     name: Annotated[str, typer.Argument(help="Config name (e.g. 'default', 'gmail')")],
     host: Annotated[str, typer.Option("--host", help="SMTP host (e.g. smtp.gmail.com)")],
-    port: Annotated[int, typer.Option("--port", help="SMTP port (e.g. 587 for TLS)")] = 587,
     user: Annotated[str, typer.Option("--user", help="SMTP username / email")],
     password: Annotated[str, typer.Option("--password", help="SMTP password (use app password for Gmail)")],
+    port: Annotated[int, typer.Option("--port", help="SMTP port (e.g. 587 for TLS)")] = 587,
     from_addr: Annotated[Optional[str], typer.Option("--from", help="From address (defaults to --user)")] = None,
     no_tls: Annotated[bool, typer.Option("--no-tls", help="Disable TLS (use plain SMTP)")] = False,
 ):
@@ -2,13 +2,17 @@
 Connection flight search and matching logic.
 Finds viable connecting itineraries between three airports (A→B→C).
 """
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
 from datetime import datetime, timedelta
 from dataclasses import dataclass
-from typing import List, Optional
-from .models import Flight
+from functools import lru_cache
+from operator import itemgetter
+from typing import List, Optional, Union
+from .models import Flight, FlightFare
 
 
-@dataclass
+@dataclass(slots=True)
 class ConnectionItinerary:
     """A complete connection itinerary with two flight segments."""
     first_segment: Flight
@@ -39,6 +43,25 @@ class ConnectionItinerary:
         return self.second_segment.arrival
 
 
+def _as_datetime(value: Union[datetime, str]) -> datetime:
+    """Accept datetimes or the scrapers' 'YYYY-MM-DD HH:MM:SS' strings."""
+    return value if isinstance(value, datetime) else datetime.fromisoformat(value)
+
+
+def _best_fare(flight: Flight, cabin: Optional[str]) -> Optional[FlightFare]:
+    """Cheapest fare on *flight*, matching *cabin* case-insensitively.
+
+    Reads Flight's per-cabin index, so this scans the few cabins present
+    rather than every fare. *cabin* must already be lower-cased.
+    """
+    if not cabin:
+        return flight.best_fare()
+    matches = [
+        fare for name, fare in flight.fares_by_cabin.items() if name.lower() == cabin
+    ]
+    return min(matches, key=lambda x: x.miles) if matches else None
+
+
 def find_connections(
     first_leg: List[Flight],
     second_leg: List[Flight],
@@ -60,42 +83,44 @@ def find_connections(
         List of ConnectionItinerary objects, sorted by total miles
     """
     connections = []
+    cabin = cabin.lower() if cabin else None
     min_layover = timedelta(hours=min_layover_hours)
     max_layover = timedelta(hours=max_layover_hours)
-    
+
+    # Bucket second-leg flights with a fare in the cabin by origin and sort
+    # each bucket by departure, so every first-leg flight only visits
+    # partners inside its layover window.
+    by_origin: dict[str, list[tuple[datetime, int, Flight, FlightFare]]] = defaultdict(list)
+    for idx, f2 in enumerate(second_leg):
+        f2_best_fare = _best_fare(f2, cabin)
+        if f2_best_fare is not None:
+            by_origin[f2.origin].append((_as_datetime(f2.departure), idx, f2, f2_best_fare))
+    departures: dict[str, list[datetime]] = {}
+    for origin, bucket in by_origin.items():
+        bucket.sort(key=itemgetter(0, 1))
+        departures[origin] = [entry[0] for entry in bucket]
+
     for f1 in first_leg:
+        # Ensure connection airport matches
+        bucket = by_origin.get(f1.destination)
+        if not bucket:
+            continue
+
         # Filter first segment by cabin if specified
-        if cabin:
-            f1_fares = [fare for fare in f1.fares if fare.cabin.lower() == cabin.lower()]
-            if not f1_fares:
-                continue
-            f1_best_fare = min(f1_fares, key=lambda x: x.miles)
-        else:
-            if not f1.fares:
-                continue
-            f1_best_fare = min(f1.fares, key=lambda x: x.miles)
-        
-        for f2 in second_leg:
-            # Check connection feasibility
-            layover = f2.departure - f1.arrival
-            if not (min_layover <= layover <= max_layover):
-                continue
-            
-            # Ensure connection airport matches
-            if f1.destination != f2.origin:
-                continue
-            
-            # Filter second segment by cabin if specified
-            if cabin:
-                f2_fares = [fare for fare in f2.fares if fare.cabin.lower() == cabin.lower()]
-                if not f2_fares:
-                    continue
-                f2_best_fare = min(f2_fares, key=lambda x: x.miles)
-            else:
-                if not f2.fares:
-                    continue
-                f2_best_fare = min(f2.fares, key=lambda x: x.miles)
-            
+        f1_best_fare = _best_fare(f1, cabin)
+        if f1_best_fare is None:
+            continue
+
+        # Check connection feasibility: departures within the layover window
+        arrival = _as_datetime(f1.arrival)
+        deps = departures[f1.destination]
+        lo = bisect_left(deps, arrival + min_layover)
+        hi = bisect_right(deps, arrival + max_layover)
+
+        # Visit in input order so ties on total miles keep their original order
+        for departure, _, f2, f2_best_fare in sorted(bucket[lo:hi], key=itemgetter(1)):
+            layover = departure - arrival
+
             # Calculate totals
             total_miles = f1_best_fare.miles + f2_best_fare.miles
             total_cash = f1_best_fare.cash + f2_best_fare.cash
@@ -116,10 +141,8 @@ def find_connections(
     return connections
 
 
+@lru_cache(maxsize=2048)
 def format_duration(minutes: int) -> str:
     """Format duration in minutes as 'Xh Ym'."""
-    hours = minutes // 60
-    mins = minutes % 60
-    if hours == 0:
-        return f"{mins}m"
-    return f"{hours}h {mins}m"
+    hours, mins = divmod(minutes, 60)
+    return f"{mins}m" if hours == 0 else f"{hours}h {mins}m"
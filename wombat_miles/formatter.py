@@ -2,6 +2,8 @@
 
 import calendar
 import csv
+import functools
+import heapq
 import io
 import json
 from collections import defaultdict
@@ -28,17 +30,30 @@ PROGRAM_LABELS = {
     "aeroplan": "Aeroplan ✈",
 }
 
+# Row order within a flight: premium cabins first, then economy
+CABIN_SORT_ORDER = {"business": 0, "first": 0, "economy": 1}
 
+
+# Fare levels repeat heavily across table cells, so the formatted strings are memoized
+@functools.lru_cache(maxsize=512)
 def format_miles(miles: int) -> str:
     """Format miles with comma separator."""
     return f"{miles:,}"
 
 
+@functools.lru_cache(maxsize=512)
 def format_cash(cash: float, currency: str = "USD") -> str:
     """Format cash amount."""
     return f"${cash:.0f}"
 
 
+def _stops_style(flight: Flight) -> str:
+    """Color for a flight's stops cell: green direct, yellow 1 stop, red 2+."""
+    if flight.is_direct:
+        return "green"
+    return "yellow" if flight.stops == 1 else "red"
+
+
 def print_results(
     result: SearchResult,
     cabin_filter: Optional[str] = None,
@@ -98,7 +113,7 @@ def print_results(
 
         # Sort fares: business first, then economy
         fares_to_show = sorted(fares_to_show, key=lambda f: (
-            {"business": 0, "first": 0, "economy": 1}.get(f.cabin, 2),
+            CABIN_SORT_ORDER.get(f.cabin, 2),
             f.miles
         ))
 
@@ -109,8 +124,7 @@ def print_results(
         )
 
         stops_display = flight.stops_display()
-        stops_style = "green" if flight.is_direct else ("yellow" if flight.stops == 1 else "red")
-        stops_text = Text(stops_display, style=stops_style)
+        stops_text = Text(stops_display, style=_stops_style(flight))
 
         for i, fare in enumerate(fares_to_show):
             cabin_style = CABIN_STYLES.get(fare.cabin, "white")
@@ -221,7 +235,7 @@ def print_multi_date_summary(
         if cabin_filter:
             flights = [
                 f for f in flights
-                if any(fare.cabin == cabin_filter for fare in f.fares)
+                if cabin_filter in f.cabin_set
             ]
 
         biz_best = None
@@ -360,20 +374,56 @@ def print_price_trend(
         )
 
 
+DAY_NAMES = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+
+@functools.lru_cache(maxsize=64)
+def _month_grid(year: int, month: int) -> tuple[tuple[tuple[int, str], ...], ...]:
+    """Weeks of (day_num, 'YYYY-MM-DD') cells for a month; day_num 0 pads."""
+    return tuple(
+        tuple((day_num, f"{year}-{month:02d}-{day_num:02d}" if day_num else "") for day_num in week)
+        for week in calendar.monthcalendar(year, month)
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _price_thresholds(prices: tuple[int, ...]) -> tuple[int, int]:
+    """Return (low, high) miles thresholds for relative calendar coloring."""
+    # Tercile-based. Use (n-1) guard so that when n is small (1-3), the top
+    # tier is always reachable: high_thresh index is capped at n-2 so
+    # sorted_prices[-1] > it.
+    if len(prices) >= 2:
+        sorted_prices = sorted(prices)
+        n = len(sorted_prices)
+        # Low threshold: bottom ~1/3 (index n//3, but at most n-2)
+        low_idx = min(n // 3, n - 2)
+        # High threshold: bottom ~2/3 (index (2n)//3, but at most n-2)
+        # so the top element is always > high_thresh → always shows red
+        high_idx = min((2 * n) // 3, n - 2)
+        return sorted_prices[low_idx], sorted_prices[high_idx]
+    if len(prices) == 1:
+        # Single price — always show as green (best available)
+        return prices[0], prices[0]
+    return 0, 0
+
+
 def print_calendar_view(
     results: list[SearchResult],
     cabin_filter: Optional[str] = None,
     origin: str = "",
     destination: str = "",
+    out: Optional[Console] = None,
 ) -> None:
     """Print award availability as a monthly calendar grid.
 
     Each cell shows the best available miles price for that day.
     Colors are relative: green=cheap, yellow=moderate, red=expensive.
     Dim cells = searched but no availability found.
+    Output goes to ``out`` if given, otherwise the module console.
     """
+    out = out or console
     if not results:
-        console.print("[dim]No results to display.[/dim]")
+        out.print("[dim]No results to display.[/dim]")
         return
 
     # Build date -> (best_miles, best_program, cabin) map
@@ -391,25 +441,7 @@ def print_calendar_view(
         if best_miles is not None:
             date_fares[result.date] = (best_miles, best_program or "", best_cabin or "")
 
-    # Compute price thresholds for relative coloring (tercile-based).
-    # Use (n-1) guard so that when n is small (1-3), the top tier is always
-    # reachable: high_thresh index is capped at n-2 so sorted_prices[-1] > it.
-    all_prices = [v[0] for v in date_fares.values()]
-    if len(all_prices) >= 2:
-        sorted_prices = sorted(all_prices)
-        n = len(sorted_prices)
-        # Low threshold: bottom ~1/3 (index n//3, but at most n-2)
-        low_idx = min(n // 3, n - 2)
-        # High threshold: bottom ~2/3 (index (2n)//3, but at most n-2)
-        # so the top element is always > high_thresh → always shows red
-        high_idx = min((2 * n) // 3, n - 2)
-        low_thresh = sorted_prices[low_idx]
-        high_thresh = sorted_prices[high_idx]
-    elif len(all_prices) == 1:
-        # Single price — always show as green (best available)
-        low_thresh = high_thresh = all_prices[0]
-    else:
-        low_thresh = high_thresh = 0
+    low_thresh, high_thresh = _price_thresholds(tuple(v[0] for v in date_fares.values()))
 
     def price_style(miles: int) -> str:
         if miles <= low_thresh:
@@ -439,7 +471,7 @@ def print_calendar_view(
     for year, month in months_seen:
         month_name = calendar.month_name[month]
         title = f"✈  {route_label}  |  {month_name} {year}  |  {cabin_label}"
-        console.print(f"\n[bold blue]{title}[/bold blue]")
+        out.print(f"\n[bold blue]{title}[/bold blue]")
 
         table = Table(
             box=box.SIMPLE_HEAD,
@@ -447,18 +479,15 @@ def print_calendar_view(
             header_style="bold cyan",
             padding=(0, 1),
         )
-        day_names = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
-        for day in day_names:
+        for day in DAY_NAMES:
             table.add_column(day, justify="center", width=9)
 
-        cal_weeks = calendar.monthcalendar(year, month)
-        for week in cal_weeks:
+        for week in _month_grid(year, month):
             row_cells = []
-            for day_num in week:
+            for day_num, date_str in week:
                 if day_num == 0:
                     row_cells.append(Text(""))
                     continue
-                date_str = f"{year}-{month:02d}-{day_num:02d}"
                 if date_str in date_fares:
                     miles, program, cab = date_fares[date_str]
                     miles_k = f"{miles // 1000}k"
@@ -472,17 +501,17 @@ def print_calendar_view(
                 row_cells.append(cell)
             table.add_row(*row_cells)
 
-        console.print(table)
+        out.print(table)
 
     # Summary footer
-    console.print(
+    out.print(
         f"[dim]{total_avail}/{total_searched} days with availability.[/dim]"
     )
     if date_fares:
         best_day, (best_miles, best_prog, _) = min(
             date_fares.items(), key=lambda x: x[1][0]
         )
-        console.print(
+        out.print(
             f"[bold]Best price:[/bold] [yellow]{best_day}[/yellow] — "
             f"[bold green]{best_miles:,} miles[/bold green] ({best_prog})\n"
         )
@@ -502,28 +531,46 @@ def print_multi_city_results(
         destination: Destination airport code
         search_date: Search date or date range
     """
+    # Buffer every print below and write the whole report in one go
+    with console:
+        _print_multi_city_body(all_results, cabin_filter, destination, search_date)
+
+
+def _print_multi_city_body(
+    all_results: dict[str, list[SearchResult]],
+    cabin_filter: Optional[str],
+    destination: str,
+    search_date: str,
+) -> None:
     if not all_results:
         console.print("[dim]No results to display.[/dim]")
         return
 
-    # Build comparison data: (origin, flight, fare) tuples
+    # Build comparison data: (origin, flight, fare) tuples, tracking each
+    # origin's cheapest fare and option count in the same pass. The count
+    # covers every matching fare for the origin (the summary's Flights column)
     comparison_data: list[tuple[str, Flight, FlightFare]] = []
-    
+    origin_best: dict[str, FlightFare] = {}
+    origin_count: dict[str, int] = defaultdict(int)
+
     for origin, results in all_results.items():
         for result in results:
             for flight in result.flights:
-                fares = flight.fares
-                if cabin_filter:
-                    fares = [f for f in fares if f.cabin == cabin_filter]
-                for fare in fares:
+                for fare in flight.fares:
+                    if cabin_filter and fare.cabin != cabin_filter:
+                        continue
                     comparison_data.append((origin, flight, fare))
+                    origin_count[origin] += 1
+                    best = origin_best.get(origin)
+                    if best is None or fare.miles < best.miles:
+                        origin_best[origin] = fare
 
     if not comparison_data:
         console.print("[dim]No flights found matching criteria.[/dim]")
         return
 
-    # Sort by miles (best deals first)
-    comparison_data.sort(key=lambda x: x[2].miles)
+    # Best deals first; only the top 20 are shown, so skip sorting the rest
+    top_deals = heapq.nsmallest(20, comparison_data, key=lambda x: x[2].miles)
 
     # Print header
     cabin_label = f" | {cabin_filter.title()}" if cabin_filter else ""
@@ -544,38 +591,27 @@ def print_multi_city_results(
     summary_table.add_column("Program")
     summary_table.add_column("Flights", justify="right")
 
-    # Compute best by origin
-    origin_best: dict[str, tuple[int, float, str, str, int]] = {}
-    origin_count: dict[str, int] = defaultdict(int)
-    
-    for origin, flight, fare in comparison_data:
-        origin_count[origin] += 1
-        if origin not in origin_best or fare.miles < origin_best[origin][0]:
-            origin_best[origin] = (fare.miles, fare.cash, fare.cabin, fare.program, origin_count[origin])
-
-    for origin in sorted(origin_best.keys()):
-        miles, cash, cabin, program, count = origin_best[origin]
-        cabin_text = Text(cabin.title(), style=CABIN_STYLES.get(cabin, "white"))
-        program_label = PROGRAM_LABELS.get(program, program)
+    for origin in sorted(origin_best):
+        fare = origin_best[origin]
         summary_table.add_row(
             origin,
-            format_miles(miles),
-            format_cash(cash),
-            cabin_text,
-            program_label,
-            str(count),
+            format_miles(fare.miles),
+            format_cash(fare.cash),
+            Text(fare.cabin.title(), style=CABIN_STYLES.get(fare.cabin, "white")),
+            PROGRAM_LABELS.get(fare.program, fare.program),
+            str(origin_count[origin]),
         )
 
     console.print(summary_table)
 
     # Detailed results table
-    console.print(f"\n[bold]🔍 Top {min(20, len(comparison_data))} Deals:[/bold]")
+    console.print(f"\n[bold]🔍 Top {len(top_deals)} Deals:[/bold]")
     detail_table = Table(
         box=box.ROUNDED,
         show_header=True,
         header_style="bold cyan",
     )
-    detail_table.add_column("Origin", no_wrap=True)
+    detail_table.add_column("Origin", style="bold cyan", no_wrap=True)
     detail_table.add_column("Flight", style="white", no_wrap=True)
     detail_table.add_column("Departs", no_wrap=True)
     detail_table.add_column("Arrives", no_wrap=True)
@@ -586,26 +622,25 @@ def print_multi_city_results(
     detail_table.add_column("Cabin", justify="center")
     detail_table.add_column("Program")
 
-    # Show top 20 results
-    for origin, flight, fare in comparison_data[:20]:
-        cabin_text = Text(fare.cabin.title(), style=CABIN_STYLES.get(fare.cabin, "white"))
-        program_label = PROGRAM_LABELS.get(fare.program, fare.program)
-        stops_display = flight.stops_display()
-        stops_style = "green" if flight.is_direct else ("yellow" if flight.stops == 1 else "red")
-        stops_text = Text(stops_display, style=stops_style)
-
-        detail_table.add_row(
-            f"[bold cyan]{origin}[/bold cyan]",
+    # Show top 20 results; styles come from the column or pre-built Text
+    # rather than inline markup Rich would have to parse per cell
+    detail_rows = [
+        (
+            origin,
             flight.flight_no,
             flight.departure[11:16] if len(flight.departure) > 10 else flight.departure,
             flight.arrival[11:16] if len(flight.arrival) > 10 else flight.arrival,
             flight.format_duration(),
-            stops_text,
+            Text(flight.stops_display(), style=_stops_style(flight)),
             format_miles(fare.miles),
             format_cash(fare.cash),
-            cabin_text,
-            program_label,
+            Text(fare.cabin.title(), style=CABIN_STYLES.get(fare.cabin, "white")),
+            PROGRAM_LABELS.get(fare.program, fare.program),
         )
+        for origin, flight, fare in top_deals
+    ]
+    for row in detail_rows:
+        detail_table.add_row(*row)
 
     console.print(detail_table)
     
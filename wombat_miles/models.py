@@ -1,10 +1,17 @@
 """Data models for wombat-miles award flight search."""
 
 from dataclasses import dataclass, field
+from operator import is_
 from typing import Optional
 
+CABIN_DISPLAY = {
+    "economy": "Economy",
+    "business": "Business",
+    "first": "First",
+}
 
-@dataclass
+
+@dataclass(slots=True)
 class FlightFare:
     """Represents a single fare/price option for a flight."""
     miles: int
@@ -15,14 +22,11 @@ class FlightFare:
     is_saver: bool = False
 
     def cabin_display(self) -> str:
-        return {
-            "economy": "Economy",
-            "business": "Business",
-            "first": "First",
-        }.get(self.cabin, self.cabin.title())
+        display = CABIN_DISPLAY.get(self.cabin)
+        return display if display is not None else self.cabin.title()
 
 
-@dataclass
+@dataclass(slots=True)
 class Segment:
     """Represents a single flight segment."""
     flight_no: str
@@ -35,8 +39,17 @@ class Segment:
     has_wifi: Optional[bool] = None
 
 
-@dataclass
-class Flight:
+class _FareIndexSlot:
+    """Private cache slot for Flight's per-cabin fare index.
+
+    Declared on a base class so it stays out of the dataclass fields:
+    asdict() and Flight(**d) (used by the results cache) never see it.
+    """
+    __slots__ = ("_fare_index",)
+
+
+@dataclass(slots=True)
+class Flight(_FareIndexSlot):
     """Represents a flight itinerary with available award fares."""
     flight_no: str
     origin: str
@@ -49,6 +62,13 @@ class Flight:
     has_wifi: Optional[bool] = None
     segments: list[Segment] = field(default_factory=list)
 
+    def __getitem__(self, cabin: str) -> FlightFare:
+        """Lowest-miles fare for *cabin*, e.g. ``flight["business"]``.
+
+        Raises KeyError if the flight has no fare in that cabin.
+        """
+        return self._indexed_fares()[1][cabin]
+
     @property
     def stops(self) -> int:
         """Number of stops (0 = direct)."""
@@ -66,14 +86,53 @@ class Flight:
             return f"1 stop ({via})"
         return f"{self.stops} stops"
 
+    def _indexed_fares(self) -> tuple:
+        """Return (snapshot, by_cabin, best, cabins), built on first use.
+
+        The index is rebuilt whenever ``self.fares`` no longer holds the same
+        fare objects as the snapshot it was built from, so reassigning the
+        list, appending, or replacing an item in place are all seen. Editing a
+        FlightFare's miles in place is not; replace the fare instead.
+        """
+        fares = self.fares
+        try:
+            cached = self._fare_index
+        except AttributeError:
+            cached = None
+        if (
+            cached is not None
+            and len(cached[0]) == len(fares)
+            and all(map(is_, cached[0], fares))
+        ):
+            return cached
+
+        by_cabin: dict[str, FlightFare] = {}
+        best: Optional[FlightFare] = None
+        for fare in fares:
+            current = by_cabin.get(fare.cabin)
+            if current is None or fare.miles < current.miles:
+                by_cabin[fare.cabin] = fare
+            if best is None or fare.miles < best.miles:
+                best = fare
+        cached = (tuple(fares), by_cabin, best, frozenset(by_cabin))
+        self._fare_index = cached
+        return cached
+
+    @property
+    def fares_by_cabin(self) -> dict[str, FlightFare]:
+        """Lowest-miles fare for each cabin present on this flight."""
+        return self._indexed_fares()[1]
+
+    @property
+    def cabin_set(self) -> frozenset[str]:
+        """Cabins with at least one fare, for O(1) membership checks."""
+        return self._indexed_fares()[3]
+
     def best_fare(self, cabin: Optional[str] = None) -> Optional[FlightFare]:
         """Get the lowest-miles fare, optionally filtered by cabin."""
-        fares = self.fares
         if cabin:
-            fares = [f for f in fares if f.cabin == cabin]
-        if not fares:
-            return None
-        return min(fares, key=lambda f: f.miles)
+            return self._indexed_fares()[1].get(cabin)
+        return self._indexed_fares()[2]
 
     def format_duration(self) -> str:
         h = self.duration // 60
@@ -81,7 +140,7 @@ class Flight:
         return f"{h}h{m:02d}m"
 
 
-@dataclass
+@dataclass(slots=True)
 class SearchResult:
     """Aggregated search results from one or more programs."""
     origin: str
@@ -12,7 +12,9 @@ import sqlite3
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, Optional
+
+from ._sqlite import ConnectionPool
 
 logger = logging.getLogger(__name__)
 
@@ -20,10 +22,93 @@ HISTORY_DIR = Path.home() / ".wombat-miles"
 HISTORY_FILE = HISTORY_DIR / "price_history.db"
 
 
+# Query text lives in module constants so every call passes the identical
+# string and hits the connection's prepared-statement cache.
+_SQL_INSERT = """
+    INSERT INTO price_snapshots
+        (origin, destination, flight_date, cabin, program,
+         miles, taxes_usd, flight_no, recorded_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_TREND = """
+    SELECT origin, destination, flight_date, cabin, program,
+           MIN(miles)      AS min_miles,
+           AVG(taxes_usd)  AS avg_taxes,
+           COUNT(*)        AS sample_count,
+           MAX(recorded_at) AS last_seen
+    FROM   price_snapshots
+    WHERE  origin = ? AND destination = ? AND recorded_at >= ?
+           {cabin_clause}
+    GROUP  BY flight_date, cabin, program
+    ORDER  BY flight_date ASC, min_miles ASC
+"""
+
+_SQL_STATS = """
+    SELECT COUNT(*)                    AS total_records,
+           MIN(miles)                  AS min_miles,
+           MAX(miles)                  AS max_miles,
+           AVG(miles)                  AS avg_miles,
+           MIN(recorded_at)            AS first_seen,
+           MAX(recorded_at)            AS last_seen,
+           COUNT(DISTINCT flight_date) AS unique_flight_dates
+    FROM   price_snapshots
+    WHERE  origin = ? AND destination = ?
+           {cabin_clause}
+"""
+
+# (all cabins, single cabin) variants of the queries that take an optional cabin
+_SQL_TREND_BY_CABIN = (
+    _SQL_TREND.format(cabin_clause=""),
+    _SQL_TREND.format(cabin_clause="AND cabin = ?"),
+)
+_SQL_STATS_BY_CABIN = (
+    _SQL_STATS.format(cabin_clause=""),
+    _SQL_STATS.format(cabin_clause="AND cabin = ?"),
+)
+
+# Historical minimum for a batch of (origin, destination, flight_date, cabin,
+# program) keys. Joining from a VALUES list lets SQLite seek the index per key.
+_SQL_FARE_MINS = """
+    WITH probe(origin, destination, flight_date, cabin, program) AS (VALUES {values})
+    SELECT p.origin, p.destination, p.flight_date, p.cabin, p.program, MIN(s.miles)
+    FROM   probe p
+    JOIN   price_snapshots s
+           ON  s.origin = p.origin AND s.destination = p.destination
+           AND s.flight_date = p.flight_date AND s.cabin = p.cabin
+           AND s.program = p.program
+    WHERE  s.recorded_at >= ?
+    GROUP  BY p.origin, p.destination, p.flight_date, p.cabin, p.program
+"""
+
+# All-time minimum per cabin for a batch of (origin, destination) routes;
+# routes with no snapshots produce no rows.
+_SQL_ROUTE_LOWS = """
+    WITH probe(origin, destination) AS (VALUES {values})
+    SELECT p.origin, p.destination, s.cabin, MIN(s.miles)
+    FROM   probe p
+    JOIN   price_snapshots s
+           ON s.origin = p.origin AND s.destination = p.destination
+    GROUP  BY p.origin, p.destination, s.cabin
+"""
+
+# Keys per _SQL_FARE_MINS query; 5 parameters each stays under SQLite's
+# historical 999-variable limit.
+_PROBE_BATCH = 150
+
+
 def _get_conn() -> sqlite3.Connection:
-    """Return an open SQLite connection, creating schema if needed."""
-    HISTORY_DIR.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(HISTORY_FILE)
+    """Return this thread's SQLite connection for HISTORY_FILE, opening it on first use."""
+    return _POOL.get(HISTORY_FILE)
+
+
+def _reset_pool() -> None:
+    """Close this thread's pooled connections (tests call this when switching DB paths)."""
+    _POOL.reset()
+
+
+def _init_schema(conn: sqlite3.Connection) -> None:
+    """Create the price history schema on a newly opened connection."""
     conn.execute("""
         CREATE TABLE IF NOT EXISTS price_snapshots (
             id           INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -42,54 +127,52 @@ def _get_conn() -> sqlite3.Connection:
         CREATE INDEX IF NOT EXISTS idx_route_date
         ON price_snapshots(origin, destination, flight_date, cabin)
     """)
+    # Serves get_price_trend's per-cabin lookback window as an index range seek.
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_route_cabin_time
+        ON price_snapshots(origin, destination, cabin, recorded_at)
+    """)
     conn.commit()
-    return conn
+
+
+_POOL = ConnectionPool(_init_schema)
 
 
 # ---------------------------------------------------------------------------
 # Recording
 # ---------------------------------------------------------------------------
 
-def record_results(results: list, cabin_filter: Optional[str] = None) -> int:
-    """Persist price snapshots from a list of SearchResult objects.
+def record_results(results: Iterable, cabin_filter: Optional[str] = None) -> int:
+    """Persist price snapshots from an iterable of SearchResult objects.
 
     Only records fares matching *cabin_filter* (or all cabins if None).
+    Rows are streamed into SQLite, so *results* may be a generator.
     Returns the number of rows inserted.
     """
     conn = _get_conn()
-    now = time.time()
-    count = 0
+    with conn:
+        cursor = conn.executemany(_SQL_INSERT, _iter_rows(results, cabin_filter, time.time()))
+    return cursor.rowcount
+
 
+def _iter_rows(results: Iterable, cabin_filter: Optional[str], now: float) -> Iterator[tuple]:
+    """Yield one price_snapshots row per fare that passes *cabin_filter*."""
     for result in results:
         for flight in result.flights:
-            fares = flight.fares
-            if cabin_filter:
-                fares = [f for f in fares if f.cabin == cabin_filter]
-            for fare in fares:
-                conn.execute(
-                    """
-                    INSERT INTO price_snapshots
-                        (origin, destination, flight_date, cabin, program,
-                         miles, taxes_usd, flight_no, recorded_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        result.origin,
-                        result.destination,
-                        result.date,
-                        fare.cabin,
-                        fare.program,
-                        fare.miles,
-                        fare.cash,
-                        flight.flight_no,
-                        now,
-                    ),
+            for fare in flight.fares:
+                if cabin_filter and fare.cabin != cabin_filter:
+                    continue
+                yield (
+                    result.origin,
+                    result.destination,
+                    result.date,
+                    fare.cabin,
+                    fare.program,
+                    fare.miles,
+                    fare.cash,
+                    flight.flight_no,
+                    now,
                 )
-                count += 1
-
-    conn.commit()
-    conn.close()
-    return count
 
 
 # ---------------------------------------------------------------------------
@@ -122,39 +205,16 @@ def get_price_trend(
     since = time.time() - lookback_days * 86400
 
     params: list = [origin.upper(), destination.upper(), since]
-    cabin_clause = ""
     if cabin:
-        cabin_clause = "AND cabin = ?"
         params.append(cabin)
 
-    rows = conn.execute(
-        f"""
-        SELECT origin, destination, flight_date, cabin, program,
-               MIN(miles)      AS min_miles,
-               AVG(taxes_usd)  AS avg_taxes,
-               COUNT(*)        AS sample_count,
-               MAX(recorded_at) AS last_seen
-        FROM   price_snapshots
-        WHERE  origin = ? AND destination = ? AND recorded_at >= ?
-               {cabin_clause}
-        GROUP  BY flight_date, cabin, program
-        ORDER  BY flight_date ASC, min_miles ASC
-        """,
-        params,
-    ).fetchall()
-    conn.close()
+    rows = conn.execute(_SQL_TREND_BY_CABIN[bool(cabin)], params).fetchall()
 
     return [
         {
-            "origin": row[0],
-            "destination": row[1],
-            "flight_date": row[2],
-            "cabin": row[3],
-            "program": row[4],
-            "min_miles": row[5],
-            "avg_taxes": round(row[6], 2) if row[6] is not None else None,
-            "sample_count": row[7],
-            "last_seen": datetime.fromtimestamp(row[8]).strftime("%Y-%m-%d %H:%M"),
+            **dict(row),
+            "avg_taxes": round(row["avg_taxes"], 2) if row["avg_taxes"] is not None else None,
+            "last_seen": datetime.fromtimestamp(row["last_seen"]).strftime("%Y-%m-%d %H:%M"),
         }
         for row in rows
     ]
@@ -174,41 +234,22 @@ def get_stats(
     """
     conn = _get_conn()
     params: list = [origin.upper(), destination.upper()]
-    cabin_clause = ""
     if cabin:
-        cabin_clause = "AND cabin = ?"
         params.append(cabin)
 
-    row = conn.execute(
-        f"""
-        SELECT COUNT(*),
-               MIN(miles), MAX(miles), AVG(miles),
-               MIN(recorded_at), MAX(recorded_at),
-               COUNT(DISTINCT flight_date)
-        FROM   price_snapshots
-        WHERE  origin = ? AND destination = ?
-               {cabin_clause}
-        """,
-        params,
-    ).fetchone()
-    conn.close()
-
-    if not row or not row[0]:
+    row = conn.execute(_SQL_STATS_BY_CABIN[bool(cabin)], params).fetchone()
+
+    if not row or not row["total_records"]:
         return {"total_records": 0}
 
-    return {
-        "total_records": row[0],
-        "min_miles": row[1],
-        "max_miles": row[2],
-        "avg_miles": round(row[3]) if row[3] is not None else None,
-        "first_seen": (
-            datetime.fromtimestamp(row[4]).strftime("%Y-%m-%d") if row[4] else None
-        ),
-        "last_seen": (
-            datetime.fromtimestamp(row[5]).strftime("%Y-%m-%d %H:%M") if row[5] else None
-        ),
-        "unique_flight_dates": row[6],
-    }
+    stats = dict(row)
+    if stats["avg_miles"] is not None:
+        stats["avg_miles"] = round(stats["avg_miles"])
+    if stats["first_seen"]:
+        stats["first_seen"] = datetime.fromtimestamp(stats["first_seen"]).strftime("%Y-%m-%d")
+    if stats["last_seen"]:
+        stats["last_seen"] = datetime.fromtimestamp(stats["last_seen"]).strftime("%Y-%m-%d %H:%M")
+    return stats
 
 
 def detect_new_lows(
@@ -226,55 +267,68 @@ def detect_new_lows(
         route, flight_date, cabin, program,
         new_miles, old_miles, drop_pct.
     """
-    alerts: list[dict] = []
-    conn = _get_conn()
     since = time.time() - lookback_days * 86400
+    candidates = [
+        (result, fare, (result.origin, result.destination, result.date, fare.cabin, fare.program))
+        for result in results
+        for flight in result.flights
+        for fare in flight.fares
+        if not cabin_filter or fare.cabin == cabin_filter
+    ]
+    historical = _historical_mins(list(dict.fromkeys(key for _, _, key in candidates)), since)
+
+    alerts: list[dict] = []
+    for result, fare, key in candidates:
+        historical_min = historical.get(key)
+        if historical_min is not None and fare.miles < historical_min:
+            drop_pct = round(
+                (historical_min - fare.miles) / historical_min * 100, 1
+            )
+            alerts.append(
+                {
+                    "route": f"{result.origin}→{result.destination}",
+                    "flight_date": result.date,
+                    "cabin": fare.cabin,
+                    "program": fare.program,
+                    "new_miles": fare.miles,
+                    "old_miles": historical_min,
+                    "drop_pct": drop_pct,
+                }
+            )
 
-    for result in results:
-        for flight in result.flights:
-            fares = flight.fares
-            if cabin_filter:
-                fares = [f for f in fares if f.cabin == cabin_filter]
-            for fare in fares:
-                row = conn.execute(
-                    """
-                    SELECT MIN(miles)
-                    FROM   price_snapshots
-                    WHERE  origin = ? AND destination = ? AND flight_date = ?
-                           AND cabin = ? AND program = ? AND recorded_at >= ?
-                    """,
-                    (
-                        result.origin,
-                        result.destination,
-                        result.date,
-                        fare.cabin,
-                        fare.program,
-                        since,
-                    ),
-                ).fetchone()
-
-                historical_min = row[0] if row and row[0] is not None else None
-
-                if historical_min is not None and fare.miles < historical_min:
-                    drop_pct = round(
-                        (historical_min - fare.miles) / historical_min * 100, 1
-                    )
-                    alerts.append(
-                        {
-                            "route": f"{result.origin}→{result.destination}",
-                            "flight_date": result.date,
-                            "cabin": fare.cabin,
-                            "program": fare.program,
-                            "new_miles": fare.miles,
-                            "old_miles": historical_min,
-                            "drop_pct": drop_pct,
-                        }
-                    )
-
-    conn.close()
     return alerts
 
 
+def _historical_mins(keys: list[tuple], since: float) -> dict[tuple, int]:
+    """Map each (origin, destination, flight_date, cabin, program) key to its
+    minimum recorded miles since *since*; keys with no history are absent."""
+    conn = _get_conn()
+    mins: dict[tuple, int] = {}
+    for start in range(0, len(keys), _PROBE_BATCH):
+        batch = keys[start:start + _PROBE_BATCH]
+        sql = _SQL_FARE_MINS.format(values=", ".join(["(?, ?, ?, ?, ?)"] * len(batch)))
+        params = [value for key in batch for value in key]
+        params.append(since)
+        for *key, miles in conn.execute(sql, params):
+            mins[tuple(key)] = miles
+    return mins
+
+
+def route_lows(routes: Iterable[tuple[str, str]]) -> dict[tuple[str, str, str], int]:
+    """Map (origin, destination, cabin) to its lowest recorded miles for every
+    cabin seen on the given routes; routes without history are absent."""
+    keys = list(dict.fromkeys((origin.upper(), destination.upper()) for origin, destination in routes))
+    conn = _get_conn()
+    lows: dict[tuple[str, str, str], int] = {}
+    for start in range(0, len(keys), _PROBE_BATCH):
+        batch = keys[start:start + _PROBE_BATCH]
+        sql = _SQL_ROUTE_LOWS.format(values=", ".join(["(?, ?)"] * len(batch)))
+        params = [value for key in batch for value in key]
+        for origin, destination, cabin, miles in conn.execute(sql, params):
+            lows[(origin, destination, cabin)] = miles
+    return lows
+
+
 def clear_history(origin: Optional[str] = None, destination: Optional[str] = None) -> int:
     """Delete price history records.
 
@@ -291,5 +345,4 @@ def clear_history(origin: Optional[str] = None, destination: Optional[str] = Non
         cursor = conn.execute("DELETE FROM price_snapshots")
     count = cursor.rowcount
     conn.commit()
-    conn.close()
     return count
@@ -1,6 +1,7 @@
 """Optimal award redemption recommendation engine."""
 
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional
 import math
 from collections import defaultdict
@@ -44,6 +45,14 @@ POPULAR_DESTINATIONS = {
     ],
 }
 
+# Frozen views of POPULAR_DESTINATIONS for get_destinations_by_region
+_DESTINATIONS_BY_REGION: dict[str, tuple[str, ...]] = {
+    region: tuple(dests) for region, dests in POPULAR_DESTINATIONS.items()
+}
+_ALL_DESTINATIONS: tuple[str, ...] = tuple(
+    dest for dests in POPULAR_DESTINATIONS.values() for dest in dests
+)
+
 # Approximate flight distances (miles) from major West Coast hubs
 # Used for CPM calculation (cents per mile flown)
 DISTANCES = {
@@ -108,8 +117,15 @@ DISTANCES = {
     ("SEA", "CDG"): 5020,
 }
 
+# Value multiplier per cabin; anything not listed is valued like economy
+CABIN_MULTIPLIERS = {
+    "economy": 1.0,
+    "business": 2.5,
+    "first": 3.0,
+}
+
 
-@dataclass
+@dataclass(slots=True)
 class Recommendation:
     """A single award redemption recommendation."""
     origin: str
@@ -132,6 +148,7 @@ class Recommendation:
         )
 
 
+@lru_cache(maxsize=4096)
 def get_distance(origin: str, destination: str) -> int:
     """Get approximate flight distance in miles."""
     key = (origin, destination)
@@ -150,11 +167,7 @@ def calculate_cabin_multiplier(cabin: str) -> float:
     Cabin value multiplier for redemption value calculation.
     Business/First class miles are worth more due to higher cash prices.
     """
-    if cabin == "first":
-        return 3.0
-    if cabin == "business":
-        return 2.5
-    return 1.0  # economy
+    return CABIN_MULTIPLIERS.get(cabin, 1.0)  # economy / unknown
 
 
 def calculate_score(
@@ -176,32 +189,31 @@ def calculate_score(
     
     Returns a composite score (higher is better).
     """
-    cabin_mult = calculate_cabin_multiplier(fare.cabin)
-    
-    # CPM for actual flight miles (not award miles)
-    # This represents "cents per mile flown" - typical benchmark is 1.0-2.0¢
-    cash_cents = fare.cash * 100
-    cents_per_flight_mile = cash_cents / distance_miles if distance_miles > 0 else 10.0
-    
+    # Penalty if over budget
+    budget_penalty = 0
+    if max_miles and fare.miles > max_miles:
+        budget_penalty = 1000  # Large penalty for unaffordable options
+
+    score = _base_score(
+        fare.miles, fare.cash * 100, distance_miles, calculate_cabin_multiplier(fare.cabin)
+    )
+    return max(0, score - budget_penalty)
+
+
+def _base_score(miles: int, cash_cents: float, distance_miles: int, cabin_mult: float) -> float:
+    """Score before any budget penalty; shared by calculate_score and rank_redemptions."""
     # Cash per award mile (how much cash you pay per award mile redeemed)
-    cash_per_mile = cash_cents / fare.miles if fare.miles > 0 else 10.0
-    
+    cash_per_mile = cash_cents / miles if miles > 0 else 10.0
+
     # Base score: distance * cabin multiplier / miles
     # This rewards long-haul premium cabin redemptions
-    base_score = (distance_miles * cabin_mult) / fare.miles if fare.miles > 0 else 0
-    
+    base_score = (distance_miles * cabin_mult) / miles if miles > 0 else 0
+
     # Penalty for high cash component (prefer lower taxes/fees)
     # Award tickets should minimize cash outlay
     cash_penalty = cash_per_mile * 0.5
-    
-    # Penalty if over budget
-    budget_penalty = 0
-    if max_miles and fare.miles > max_miles:
-        budget_penalty = 1000  # Large penalty for unaffordable options
-    
-    final_score = base_score - cash_penalty - budget_penalty
-    
-    return max(0, final_score)
+
+    return base_score - cash_penalty
 
 
 def rank_redemptions(
@@ -225,8 +237,11 @@ def rank_redemptions(
     recommendations = []
     
     for origin, destination, date, flight in flights:
-        distance = get_distance(origin, destination)
-        
+        # Skip the whole flight before touching its fares or distance
+        if cabin and cabin not in flight.cabin_set:
+            continue
+        distance = None
+
         for fare in flight.fares:
             # Apply filters
             if cabin and fare.cabin != cabin:
@@ -235,13 +250,16 @@ def rank_redemptions(
                 continue
             if max_miles and fare.miles > max_miles:
                 continue
-            
+
+            if distance is None:
+                distance = get_distance(origin, destination)
             cabin_mult = calculate_cabin_multiplier(fare.cabin)
             cash_cents = fare.cash * 100
             cash_per_mile = cash_cents / fare.miles if fare.miles > 0 else 0
             cents_per_flight_mile = cash_cents / distance if distance > 0 else 0
-            
-            score = calculate_score(fare, distance, max_miles)
+
+            # Over-budget fares were skipped above, so no budget penalty applies
+            score = max(0, _base_score(fare.miles, cash_cents, distance, cabin_mult))
             
             rec = Recommendation(
                 origin=origin,
@@ -277,15 +295,5 @@ def get_destinations_by_region(
     Returns:
         List of IATA airport codes
     """
-    if region and region in POPULAR_DESTINATIONS:
-        destinations = POPULAR_DESTINATIONS[region]
-    else:
-        # All destinations
-        destinations = []
-        for dests in POPULAR_DESTINATIONS.values():
-            destinations.extend(dests)
-    
-    if limit:
-        destinations = destinations[:limit]
-    
-    return destinations
+    destinations = _DESTINATIONS_BY_REGION.get(region, _ALL_DESTINATIONS)
+    return list(destinations[:limit or None])
@@ -3,13 +3,28 @@
 import asyncio
 import json
 import logging
+import sys
 from typing import Any, Optional
 
+try:
+    import orjson
+except ImportError:  # optional speedup, see pyproject [fast] extra
+    orjson = None
+
 from .base import BaseScraper
 from ..models import Flight, FlightFare, Segment
 
 logger = logging.getLogger(__name__)
 
+# Response bodies can be several MB; orjson decodes them ~5x faster than stdlib.
+_loads = orjson.loads if orjson else json.loads
+
+# Airport/airline codes, flight numbers and aircraft names repeat across every
+# itinerary in a response; interning shares one copy and makes == a pointer check.
+def _intern(s):
+    """sys.intern for str values; JSON nulls and other types pass through."""
+    return sys.intern(s) if type(s) is str else s
+
 AEROPLAN_URL = "https://www.aircanada.com/aeroplan/redeem/availability/outbound"
 API_URL_PATTERN = "**/loyalty/dapidynamic/**/v2/search/air-bounds"
 
@@ -84,7 +99,7 @@ class AeroplanScraper(BaseScraper):
                         and not api_response_future.done()
                     ):
                         try:
-                            body = await response.json()
+                            body = _loads(await response.body())
                             api_response_future.set_result(body)
                         except Exception as e:
                             if not api_response_future.done():
@@ -120,7 +135,7 @@ class AeroplanScraper(BaseScraper):
 
         # Filter by cabin if specified
         if cabin:
-            flights = [f for f in flights if any(fare.cabin == cabin for fare in f.fares)]
+            flights = [f for f in flights if cabin in f.cabin_set]
             for f in flights:
                 f.fares = [fare for fare in f.fares if fare.cabin == cabin]
 
@@ -147,125 +162,133 @@ class AeroplanScraper(BaseScraper):
         flight_dict = dictionaries.get("flight", {})
         aircraft_dict = dictionaries.get("aircraft", {})
 
-        results: list[Flight] = []
-
-        for group in air_bound_groups:
-            bound_details = group.get("boundDetails", {})
-            segments_raw = bound_details.get("segments", [])
-            num_segments = len(segments_raw)
-            stops = num_segments - 1
-
-            # Filter by max stops
-            if stops > max_stops:
-                continue
-
-            # Get first and last segment info
-            first_flight_id = segments_raw[0].get("flightId", "")
-            last_flight_id = segments_raw[-1].get("flightId", "")
-
-            first_info = flight_dict.get(first_flight_id)
-            last_info = flight_dict.get(last_flight_id)
-            if not first_info or not last_info:
-                continue
-
-            itinerary_origin = first_info.get("departure", {}).get("locationCode", "")
-            itinerary_dest = last_info.get("arrival", {}).get("locationCode", "")
+        return [
+            flight
+            for group in air_bound_groups
+            if (flight := self._build_flight(group, flight_dict, aircraft_dict, origin, destination, max_stops)) is not None
+        ]
 
-            if itinerary_origin != origin or itinerary_dest != destination:
+    def _build_flight(
+        self,
+        group: dict,
+        flight_dict: dict,
+        aircraft_dict: dict,
+        origin: str,
+        destination: str,
+        max_stops: int,
+    ) -> Optional[Flight]:
+        """Build a Flight from one airBoundGroup, or None if it is filtered out."""
+        bound_details = group.get("boundDetails", {})
+        segments_raw = bound_details.get("segments", [])
+        num_segments = len(segments_raw)
+
+        # Filter by max stops before any lookups (also skips empty itineraries)
+        if not 0 < num_segments <= max_stops + 1:
+            return None
+
+        # Resolve each segment's flight entry once; reused for the route
+        # check and the segment loop below
+        seg_infos = [flight_dict.get(seg_ref.get("flightId", "")) for seg_ref in segments_raw]
+        first_info = seg_infos[0]
+        last_info = seg_infos[-1]
+        if not first_info or not last_info:
+            return None
+
+        itinerary_origin = first_info.get("departure", {}).get("locationCode", "")
+        itinerary_dest = last_info.get("arrival", {}).get("locationCode", "")
+
+        if itinerary_origin != origin or itinerary_dest != destination:
+            return None
+
+        # Parse fares first so itineraries without any are skipped before
+        # segments are built. Only the cheapest fare per cabin is kept, so track
+        # (miles, taxes_cents, booking_class) tuples and build FlightFare
+        # objects for the winners only.
+        cabin_best: dict[str, tuple[int, int, str]] = {}
+        first_marketing_code = first_info.get("marketingAirlineCode", "")
+
+        for air_bound in group.get("airBounds", []):
+            avail_details = air_bound.get("availabilityDetails", [{}])
+            if not avail_details:
                 continue
 
-            # Build segment list
-            parsed_segments: list[Segment] = []
-            aircraft_list = []
-            total_duration = 0
-
-            for seg_ref in segments_raw:
-                fid = seg_ref.get("flightId", "")
-                finfo = flight_dict.get(fid)
-                if not finfo:
-                    continue
-
-                dep = finfo.get("departure", {})
-                arr = finfo.get("arrival", {})
-                mcode = finfo.get("marketingAirlineCode", "")
-                mnum = finfo.get("marketingFlightNumber", "")
-                acode = finfo.get("aircraftCode", "")
-                aircraft_name = aircraft_dict.get(acode, acode)
-                aircraft_list.append(aircraft_name)
-
-                seg_duration_sec = finfo.get("duration", 0)
-                seg_duration_min = seg_duration_sec // 60 if seg_duration_sec > 0 else 0
-                total_duration += seg_duration_min
-
-                parsed_segments.append(Segment(
-                    flight_no=f"{mcode} {mnum}".strip(),
-                    origin=dep.get("locationCode", ""),
-                    destination=arr.get("locationCode", ""),
-                    departure=dep.get("dateTime", "")[:19].replace("T", " "),
-                    arrival=arr.get("dateTime", "")[:19].replace("T", " "),
-                    duration=seg_duration_min,
-                    aircraft=aircraft_name or "Unknown",
-                ))
-
-            # Build display flight number
-            if num_segments == 1:
-                display_flight_no = parsed_segments[0].flight_no
-            else:
-                display_flight_no = " → ".join(s.flight_no for s in parsed_segments)
-
-            flight = Flight(
-                flight_no=display_flight_no,
-                origin=itinerary_origin,
-                destination=itinerary_dest,
-                departure=parsed_segments[0].departure,
-                arrival=parsed_segments[-1].arrival,
-                duration=total_duration,
-                aircraft=", ".join(dict.fromkeys(aircraft_list)),
-                has_wifi=None,
-                segments=parsed_segments,
+            detail = avail_details[0]
+            cabin_raw = detail.get("cabin", "eco")
+            cabin = CABIN_MAP.get(cabin_raw, "economy")
+            booking_class = _intern(detail.get("bookingClass", "?"))
+
+            # Special case: UA markets Business class as First (I booking class)
+            if booking_class == "I" and first_marketing_code == "UA":
+                cabin = "economy"
+
+            prices = air_bound.get("prices", {})
+            conversion = prices.get("milesConversion", {})
+            converted = conversion.get("convertedMiles", {})
+
+            miles = converted.get("base", 0)
+            existing = cabin_best.get(cabin)
+            if existing is None or miles < existing[0]:
+                cabin_best[cabin] = (miles, converted.get("totalTaxes", 0), booking_class)
+
+        fares = [
+            FlightFare(
+                miles=miles,
+                cash=round(taxes_cents / 100, 2),
+                cabin=cabin,
+                booking_class=booking_class,
+                program="aeroplan",
             )
+            for cabin, (miles, taxes_cents, booking_class) in cabin_best.items()
+        ]
+        if not fares:
+            return None
+
+        # Build segment list
+        parsed_segments: list[Segment] = []
+        aircraft_list = []
+        total_duration = 0
+
+        for finfo in seg_infos:
+            if not finfo:
+                continue
 
-            # Parse fares
-            cabin_best: dict[str, FlightFare] = {}
-            first_marketing_code = first_info.get("marketingAirlineCode", "")
-
-            for air_bound in group.get("airBounds", []):
-                avail_details = air_bound.get("availabilityDetails", [{}])
-                if not avail_details:
-                    continue
-
-                detail = avail_details[0]
-                cabin_raw = detail.get("cabin", "eco")
-                cabin = CABIN_MAP.get(cabin_raw, "economy")
-                booking_class = detail.get("bookingClass", "?")
-
-                # Special case: UA markets Business class as First (I booking class)
-                if booking_class == "I" and first_marketing_code == "UA":
-                    cabin = "economy"
-
-                prices = air_bound.get("prices", {})
-                conversion = prices.get("milesConversion", {})
-                converted = conversion.get("convertedMiles", {})
-                remaining = conversion.get("remainingNonConverted", {})
-
-                miles = converted.get("base", 0)
-                taxes_cents = converted.get("totalTaxes", 0)
-                cash = round(taxes_cents / 100, 2)
-
-                fare = FlightFare(
-                    miles=miles,
-                    cash=cash,
-                    cabin=cabin,
-                    booking_class=booking_class,
-                    program="aeroplan",
-                )
-
-                existing = cabin_best.get(cabin)
-                if existing is None or miles < existing.miles:
-                    cabin_best[cabin] = fare
-
-            flight.fares = list(cabin_best.values())
-            if flight.fares:
-                results.append(flight)
-
-        return results
+            dep = finfo.get("departure", {})
+            arr = finfo.get("arrival", {})
+            mcode = finfo.get("marketingAirlineCode", "")
+            mnum = finfo.get("marketingFlightNumber", "")
+            acode = finfo.get("aircraftCode", "")
+            aircraft_name = _intern(aircraft_dict.get(acode, acode))
+            aircraft_list.append(aircraft_name)
+
+            seg_duration_sec = finfo.get("duration", 0)
+            seg_duration_min = seg_duration_sec // 60 if seg_duration_sec > 0 else 0
+            total_duration += seg_duration_min
+
+            parsed_segments.append(Segment(
+                flight_no=_intern(f"{mcode} {mnum}".strip()),
+                origin=_intern(dep.get("locationCode", "")),
+                destination=_intern(arr.get("locationCode", "")),
+                departure=dep.get("dateTime", "")[:19].replace("T", " "),
+                arrival=arr.get("dateTime", "")[:19].replace("T", " "),
+                duration=seg_duration_min,
+                aircraft=aircraft_name or "Unknown",
+            ))
+
+        # Build display flight number
+        if num_segments == 1:
+            display_flight_no = parsed_segments[0].flight_no
+        else:
+            display_flight_no = " → ".join(s.flight_no for s in parsed_segments)
+
+        return Flight(
+            flight_no=display_flight_no,
+            origin=_intern(itinerary_origin),
+            destination=_intern(itinerary_dest),
+            departure=parsed_segments[0].departure,
+            arrival=parsed_segments[-1].arrival,
+            duration=total_duration,
+            aircraft=", ".join(dict.fromkeys(aircraft_list)),
+            fares=fares,
+            has_wifi=None,
+            segments=parsed_segments,
+        )
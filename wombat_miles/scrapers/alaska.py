@@ -1,15 +1,32 @@
 """Alaska Atmos Rewards award flight scraper using Playwright."""
 
 import asyncio
+import functools
 import json
 import logging
+import sys
+from collections.abc import Mapping
 from typing import Any, Optional
 
+try:
+    import orjson
+except ImportError:  # optional speedup, see pyproject [fast] extra
+    orjson = None
+
 from .base import BaseScraper
 from ..models import Flight, FlightFare, Segment
 
 logger = logging.getLogger(__name__)
 
+# Response bodies can be several MB; orjson decodes them ~5x faster than stdlib.
+_loads = orjson.loads if orjson else json.loads
+
+# Airport/airline codes, flight numbers and aircraft names repeat across every
+# itinerary in a response; interning shares one copy and makes == a pointer check.
+def _intern(s):
+    """sys.intern for str values; JSON nulls and other types pass through."""
+    return sys.intern(s) if type(s) is str else s
+
 ALASKA_API_URL = "https://www.alaskaair.com/searchbff/V3/search"
 
 CABIN_MAP = {
@@ -44,6 +61,26 @@ BLOCK_URLS = [
 ]
 
 
+@functools.lru_cache(maxsize=512)
+def _parse_duration_minutes(s: str) -> int:
+    """Parse duration string to minutes.
+
+    Cached: a response repeats the same handful of values ("95", "2h30m")
+    across hundreds of segments.
+    """
+    try:
+        return int(s)
+    except ValueError:
+        pass
+    total = 0
+    if "h" in s:
+        h, _, s = s.partition("h")
+        total += int(h) * 60
+    if "m" in s:
+        total += int(s.replace("m", ""))
+    return total
+
+
 class AlaskaScraper(BaseScraper):
     """Scraper for Alaska Atmos Rewards award availability using Playwright."""
 
@@ -83,7 +120,7 @@ class AlaskaScraper(BaseScraper):
         flights = self._parse_response(raw_data, origin.upper(), destination.upper(), max_stops=max_stops)
 
         if cabin:
-            flights = [f for f in flights if any(fare.cabin == cabin for fare in f.fares)]
+            flights = [f for f in flights if cabin in f.cabin_set]
             for f in flights:
                 f.fares = [fare for fare in f.fares if fare.cabin == cabin]
 
@@ -123,7 +160,7 @@ class AlaskaScraper(BaseScraper):
                     ):
                         try:
                             if response.status == 200:
-                                body = await response.json()
+                                body = _loads(await response.body())
                                 api_response_future.set_result(body)
                             else:
                                 logger.warning(f"Alaska API returned status {response.status}")
@@ -188,137 +225,140 @@ class AlaskaScraper(BaseScraper):
             logger.info("No scheduled flights between cities (Alaska)")
             return []
 
-        results: list[Flight] = []
+        return [
+            flight
+            for slice_data in slices
+            if (flight := self._build_flight(slice_data, origin, destination, max_stops)) is not None
+        ]
 
-        for slice_data in slices:
-            segments_raw = slice_data.get("segments", [])
-            num_segments = len(segments_raw)
-            stops = num_segments - 1
+    def _build_flight(
+        self,
+        slice_data: dict,
+        origin: str,
+        destination: str,
+        max_stops: int,
+    ) -> Optional[Flight]:
+        """Build a Flight from one slice, or None if it is filtered out."""
+        segments_raw = slice_data.get("segments", [])
+        num_segments = len(segments_raw)
+
+        # Filter by max stops before any lookups (also skips empty itineraries)
+        if not 0 < num_segments <= max_stops + 1:
+            return None
 
-            # Filter by max stops
-            if stops > max_stops:
-                continue
+        # Check that the route starts and ends correctly
+        first_seg = segments_raw[0]
+        last_seg = segments_raw[-1]
+        itinerary_origin = first_seg.get("departureStation", "")
+        itinerary_dest = last_seg.get("arrivalStation", "")
 
-            # Check that the route starts and ends correctly
-            first_seg = segments_raw[0]
-            last_seg = segments_raw[-1]
-            itinerary_origin = first_seg.get("departureStation", "")
-            itinerary_dest = last_seg.get("arrivalStation", "")
+        if itinerary_origin != origin or itinerary_dest != destination:
+            return None
 
-            if itinerary_origin != origin or itinerary_dest != destination:
+        # Parse fares first so slices without any are skipped before
+        # segments are built
+        fares_raw = slice_data.get("fares", {})
+        if isinstance(fares_raw, Mapping):
+            fares_raw = fares_raw.values()
+
+        # Only the cheapest fare per cabin is kept, so track
+        # (miles, cash, booking_class, is_saver) tuples and build
+        # FlightFare objects for the winners only.
+        cabin_best: dict[str, tuple[int, float, str, bool]] = {}
+
+        for fare_data in fares_raw:
+            booking_codes = fare_data.get("bookingCodes", [])
+            cabins_raw = fare_data.get("cabins", [])
+            if not booking_codes or not cabins_raw:
                 continue
 
-            # Build segment list
-            parsed_segments: list[Segment] = []
-            total_duration = 0
-            all_wifi = True
-            any_wifi_known = False
-            aircraft_list = []
-
-            for seg in segments_raw:
-                carrier = seg.get("publishingCarrier", {})
-                seg_flight_no = f"{carrier.get('carrierCode', '')} {carrier.get('flightNumber', '')}".strip()
-
-                amenities = seg.get("amenities", [])
-                seg_wifi = "Wi-Fi" in amenities if amenities else None
-                if seg_wifi is not None:
-                    any_wifi_known = True
-                    if not seg_wifi:
-                        all_wifi = False
-
-                duration_raw = seg.get("duration", 0)
-                if isinstance(duration_raw, int):
-                    seg_duration = duration_raw
-                elif isinstance(duration_raw, str):
-                    seg_duration = self._parse_duration(duration_raw)
-                else:
-                    seg_duration = 0
-                total_duration += seg_duration
-
-                aircraft_list.append(seg.get("aircraft", "Unknown"))
-
-                parsed_segments.append(Segment(
-                    flight_no=seg_flight_no,
-                    origin=seg.get("departureStation", ""),
-                    destination=seg.get("arrivalStation", ""),
-                    departure=seg.get("departureTime", "")[:19].replace("T", " "),
-                    arrival=seg.get("arrivalTime", "")[:19].replace("T", " "),
-                    duration=seg_duration,
-                    aircraft=seg.get("aircraft", "Unknown"),
-                    has_wifi=seg_wifi,
-                ))
-
-            # Build display flight number (join segment flight numbers)
-            if num_segments == 1:
-                display_flight_no = parsed_segments[0].flight_no
-            else:
-                display_flight_no = " → ".join(s.flight_no for s in parsed_segments)
-
-            has_wifi = all_wifi if any_wifi_known else None
-
-            flight = Flight(
-                flight_no=display_flight_no,
-                origin=itinerary_origin,
-                destination=itinerary_dest,
-                departure=parsed_segments[0].departure,
-                arrival=parsed_segments[-1].arrival,
-                duration=total_duration,
-                aircraft=", ".join(dict.fromkeys(aircraft_list)),  # deduplicate preserving order
-                has_wifi=has_wifi,
-                segments=parsed_segments,
-            )
-
-            # Parse fares
-            fares_raw = slice_data.get("fares", {})
-            if isinstance(fares_raw, dict):
-                fares_raw = list(fares_raw.values())
-
-            cabin_best: dict[str, FlightFare] = {}
-
-            for fare_data in fares_raw:
-                booking_codes = fare_data.get("bookingCodes", [])
-                cabins_raw = fare_data.get("cabins", [])
-                if not booking_codes or not cabins_raw:
-                    continue
-
-                cabin_raw = cabins_raw[0]
-                cabin = CABIN_MAP.get(cabin_raw, "economy")
-                booking_class = booking_codes[0]
-                miles = fare_data.get("milesPoints", 0)
-                cash = fare_data.get("grandTotal", 0.0)
-                is_saver = cabin_raw == "SAVER"
-
-                fare = FlightFare(
-                    miles=miles,
-                    cash=float(cash),
-                    cabin=cabin,
-                    booking_class=booking_class,
-                    program="alaska",
-                    is_saver=is_saver,
+            cabin_raw = cabins_raw[0]
+            cabin = CABIN_MAP.get(cabin_raw, "economy")
+            miles = fare_data.get("milesPoints", 0)
+
+            existing = cabin_best.get(cabin)
+            if existing is None or miles < existing[0]:
+                cabin_best[cabin] = (
+                    miles,
+                    fare_data.get("grandTotal", 0.0),
+                    _intern(booking_codes[0]),
+                    cabin_raw == "SAVER",
                 )
 
-                existing = cabin_best.get(cabin)
-                if existing is None or miles < existing.miles:
-                    cabin_best[cabin] = fare
-
-            flight.fares = list(cabin_best.values())
-            if flight.fares:
-                results.append(flight)
+        fares = [
+            FlightFare(
+                miles=miles,
+                cash=float(cash),
+                cabin=cabin,
+                booking_class=booking_class,
+                program="alaska",
+                is_saver=is_saver,
+            )
+            for cabin, (miles, cash, booking_class, is_saver) in cabin_best.items()
+        ]
+        if not fares:
+            return None
 
-        return results
+        # Build segment list
+        parsed_segments: list[Segment] = []
+        total_duration = 0
+        all_wifi = True
+        any_wifi_known = False
+        aircraft_list = []
+
+        for seg in segments_raw:
+            carrier = seg.get("publishingCarrier", {})
+            seg_flight_no = _intern(f"{carrier.get('carrierCode', '')} {carrier.get('flightNumber', '')}".strip())
+
+            amenities = seg.get("amenities", [])
+            seg_wifi = "Wi-Fi" in amenities if amenities else None
+            if seg_wifi is not None:
+                any_wifi_known = True
+                if not seg_wifi:
+                    all_wifi = False
+
+            duration_raw = seg.get("duration", 0)
+            if isinstance(duration_raw, int):
+                seg_duration = duration_raw
+            elif isinstance(duration_raw, str):
+                seg_duration = self._parse_duration(duration_raw)
+            else:
+                seg_duration = 0
+            total_duration += seg_duration
+
+            seg_aircraft = _intern(seg.get("aircraft", "Unknown"))
+            aircraft_list.append(seg_aircraft)
+
+            parsed_segments.append(Segment(
+                flight_no=seg_flight_no,
+                origin=_intern(seg.get("departureStation", "")),
+                destination=_intern(seg.get("arrivalStation", "")),
+                departure=seg.get("departureTime", "")[:19].replace("T", " "),
+                arrival=seg.get("arrivalTime", "")[:19].replace("T", " "),
+                duration=seg_duration,
+                aircraft=seg_aircraft,
+                has_wifi=seg_wifi,
+            ))
+
+        # Build display flight number (join segment flight numbers)
+        if num_segments == 1:
+            display_flight_no = parsed_segments[0].flight_no
+        else:
+            display_flight_no = " → ".join(s.flight_no for s in parsed_segments)
+
+        has_wifi = all_wifi if any_wifi_known else None
+
+        return Flight(
+            flight_no=display_flight_no,
+            origin=_intern(itinerary_origin),
+            destination=_intern(itinerary_dest),
+            departure=parsed_segments[0].departure,
+            arrival=parsed_segments[-1].arrival,
+            duration=total_duration,
+            aircraft=", ".join(dict.fromkeys(aircraft_list)),  # deduplicate preserving order
+            fares=fares,
+            has_wifi=has_wifi,
+            segments=parsed_segments,
+        )
 
-    @staticmethod
-    def _parse_duration(s: str) -> int:
-        """Parse duration string to minutes."""
-        try:
-            return int(s)
-        except ValueError:
-            pass
-        total = 0
-        if "h" in s:
-            parts = s.split("h")
-            total += int(parts[0]) * 60
-            s = parts[1]
-        if "m" in s:
-            total += int(s.replace("m", ""))
-        return total
+    _parse_duration = staticmethod(_parse_duration_minutes)
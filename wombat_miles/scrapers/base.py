@@ -1,7 +1,8 @@
 """Base scraper interface."""
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Iterable, Optional
 from ..models import Flight
 
 
@@ -37,3 +38,26 @@ class BaseScraper(ABC):
             List of flights with available award fares.
         """
         ...
+
+    async def search_many(
+        self,
+        routes: Iterable[tuple[str, str, str]],
+        cabin: Optional[str] = None,
+        max_stops: int = 0,
+        concurrency: int = 5,
+    ) -> list[list[Flight]]:
+        """
+        Search several (origin, destination, date) routes concurrently.
+
+        Each search opens its own browser, so at most *concurrency* run at once.
+
+        Returns:
+            One flight list per route, in the same order as *routes*.
+        """
+        sem = asyncio.Semaphore(concurrency)
+
+        async def bounded(origin: str, destination: str, date: str) -> list[Flight]:
+            async with sem:
+                return await self.search(origin, destination, date, cabin, max_stops=max_stops)
+
+        return list(await asyncio.gather(*(bounded(*route) for route in routes)))